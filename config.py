@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 # Application Settings
@@ -23,6 +24,9 @@ FILE_TYPES = {
     ".rar": "RAR"
 }
 
+# Distinct file types, alphabetical, for selection lists
+FILE_TYPE_CHOICES = sorted(set(FILE_TYPES.values()))
+
 # Metadata Fields
 METADATA_FIELDS = [
     "department",
@@ -54,7 +58,16 @@ LOG_ROTATION = 'W0'  # Weekly rotation on Monday
 UI_THEME = "litera"  # ttkbootstrap theme
 UI_PADDING = 10
 UI_BUTTON_WIDTH = 15
+FOLDER_EXISTS_CACHE_TTL = 2.0  # Seconds a folder existence check is reused
+FILTER_DEBOUNCE_MS = 150  # Pause in typing before the file filter runs
+FILE_LIST_CHUNK_SIZE = 200  # File rows inserted per idle callback
+RESIZE_DEBOUNCE_MS = 50  # Pause in window resizing before layout is updated
 
 # Search Settings
 MAX_RECENT_PROJECTS = 5
-SEARCH_RESULTS_PER_PAGE = 50
\ No newline at end of file
+SEARCH_RESULTS_PER_PAGE = 50
+SEARCH_DEBOUNCE_MS = 150  # Window in which repeated Enter presses run one search
+
+# Scanner Settings
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)  # Threads for I/O-bound folder listing
+SCAN_BATCH_SIZE = 1000  # Scanned rows staged per database transaction
@@ -1,22 +1,251 @@
+import os
 import sqlite3
 import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
+
+# Column order of the rows produced by FileScanner for bulk inserts
+FILE_SCAN_COLUMNS = (
+    'file_path',
+    'file_name',
+    'source',
+    'file_type',
+    'last_modified',
+    'created_date'
+)
+
+# Every files_metadata column but file_id, in declaration order
+FILE_METADATA_COLUMNS = (
+    'file_path',
+    'file_name',
+    'source',
+    'file_type',
+    'issue_status',
+    'revision',
+    'department',
+    'drawing_type',
+    'plant_area',
+    'equipment_included',
+    'notes',
+    'todos',
+    'last_modified',
+    'created_date'
+)
+_METADATA_COLUMN_SET = frozenset(FILE_METADATA_COLUMNS)
+
+# Expression matching created_date's column DEFAULT (now, in epoch seconds)
+_NOW_EPOCH_SQL = "((julianday('now') - 2440587.5) * 86400.0)"
+
+# Files whose metadata rows are kept in memory by DatabaseManager
+_METADATA_CACHE_SIZE = 4096
+
+# Recent search results kept by DatabaseManager.search_files_cached, and
+# how many seconds one is reused while the database is unchanged
+_SEARCH_RESULT_CACHE_SIZE = 32
+_SEARCH_RESULT_TTL = 30.0
+
+# Matches FileMetadata.is_fully_tagged in models.py
+_FULLY_TAGGED_SQL = (
+    "CASE WHEN trim(department) <> '' AND trim(revision) <> '' "
+    "AND trim(drawing_type) <> '' THEN 1 ELSE 0 END"
+)
+
+@lru_cache(maxsize=None)
+def _update_sql(key_column: str, columns: Tuple[str, ...]) -> str:
+    """Build the files_metadata UPDATE setting exactly the given columns"""
+    set_clause = ', '.join(f"{c} = ?" for c in columns)
+    return f"UPDATE files_metadata SET {set_clause} WHERE {key_column} = ?"
+
+# One INSERT for every column set; missing fields bind NULL, and
+# created_date falls back to its default as it would if omitted
+_INSERT_SQL = "INSERT INTO files_metadata ({columns}) VALUES ({placeholders})".format(
+    columns=', '.join(FILE_METADATA_COLUMNS),
+    placeholders=', '.join(
+        f"COALESCE(?, {_NOW_EPOCH_SQL})" if c == 'created_date' else '?'
+        for c in FILE_METADATA_COLUMNS
+    )
+)
+
+def _check_columns(columns: Iterable[str]) -> None:
+    """Raise ValueError for names that aren't files_metadata columns"""
+    unknown = set(columns) - _METADATA_COLUMN_SET - {'file_id'}
+    if unknown:
+        raise ValueError(f"Unknown metadata columns: {', '.join(sorted(unknown))}")
+
+def _epoch_sql(value: str, *modifiers: str) -> str:
+    """SQL expression converting a local date/time string to epoch seconds"""
+    args = ''.join(f", '{m}'" for m in modifiers)
+    return f"((julianday({value}{args}, 'utc') - 2440587.5) * 86400.0)"
+
+# Columns searched by exact (case-insensitive) value unless a * is given;
+# the search screen offers these from fixed lists
+_EXACT_MATCH_COLUMNS = ('file_type', 'department')
+
+# Free-text columns mirrored into the files_fts trigram index. The trigram
+# tokenizer answers case-insensitive LIKE '%...%' from the index, so
+# substring searches keep their LIKE semantics without a full table scan
+_FTS_COLUMNS = (
+    'file_name',
+    'file_path',
+    'drawing_type',
+    'plant_area',
+    'equipment_included',
+    'notes',
+    'todos'
+)
+
+# WHERE clause templates per search bucket, in the order they are applied
+_SEARCH_CLAUSES = (
+    "{key} = ? COLLATE NOCASE",
+    "{key} >= " + _epoch_sql('?') + " AND {key} < " + _epoch_sql('?', '+1 day'),
+    # Full-text terms; _search_where merges them into a single subquery
+    "{key} LIKE ?",
+    # LIKE is case-insensitive for ASCII already; leaving the column
+    # unwrapped lets anchored patterns use a NOCASE index
+    "{key} LIKE ? ESCAPE '\\'",
+)
+
+# Scanned rows are staged in a TEMP table, then merged in one statement.
+# Known paths only get their file attributes refreshed when the file changed
+# on disk; user-entered metadata columns are left untouched.
+_SCAN_COLUMN_LIST = ', '.join(FILE_SCAN_COLUMNS)
+# Fixed for the scanner's row shape, so every scan reuses one cached statement
+_STAGE_SCAN_SQL = "INSERT OR REPLACE INTO temp.scan_seen ({columns}) VALUES ({placeholders})".format(
+    columns=_SCAN_COLUMN_LIST,
+    placeholders=', '.join('?' for _ in FILE_SCAN_COLUMNS)
+)
+_UPSERT_SCAN_SQL = """
+    INSERT INTO files_metadata ({columns})
+    SELECT {columns} FROM temp.scan_seen WHERE true
+    ON CONFLICT(file_path) DO UPDATE SET {updates}
+    WHERE excluded.last_modified > files_metadata.last_modified
+""".format(
+    columns=_SCAN_COLUMN_LIST,
+    updates=', '.join(f"{c} = excluded.{c}" for c in FILE_SCAN_COLUMNS[1:])
+)
+
+def _convert_datetime(value: bytes) -> datetime:
+    """Parse a CURRENT_TIMESTAMP value from a column selected as [DATETIME]"""
+    return datetime.fromisoformat(value.decode())
+
+sqlite3.register_converter('DATETIME', _convert_datetime)
+
+# last_accessed comes back as a datetime via _convert_datetime
+_RECENT_FOLDERS_SQL = '''
+    SELECT folder_id, folder_path,
+           last_accessed AS "last_accessed [DATETIME]"
+    FROM recent_folders 
+    ORDER BY last_accessed DESC 
+    LIMIT ?
+'''
 
 class DatabaseManager:
     def __init__(self, db_path: str = "fms.db"):
         self.db_path = db_path
         self.logger = logging.getLogger('database')
+        # Single long-lived connection in autocommit mode; writes are
+        # grouped with explicit BEGIN/COMMIT via _transaction(). Only plain
+        # str/float/int values are bound (file times are epoch floats).
+        # Converters run only for columns a query names as "col [TYPE]";
+        # declared types are ignored, since older files_metadata tables
+        # declare DATETIME but hold epoch floats
+        self.conn = sqlite3.connect(
+            self.db_path,
+            detect_types=sqlite3.PARSE_COLNAMES,
+            isolation_level=None,
+            check_same_thread=False,
+            # Prepared statements are reused by exact SQL text; room for the
+            # fixed statements plus one per search criteria shape
+            cached_statements=256
+        )
+        self.conn.text_factory = str
+        # Set once for the connection; every read returns sqlite3.Row
+        self.conn.row_factory = sqlite3.Row
+        # Tk callbacks and the scanner share the connection; the lock keeps
+        # one caller's statements out of another's open transaction
+        self._lock = threading.RLock()
+        # Bumped on every committed write so screens can skip refreshes
+        # when nothing changed since they last loaded
+        self.version = 0
+        # WHERE clauses built by _search_where, keyed by criteria shape
+        self._search_sql_cache: Dict[Tuple[Tuple[int, str], ...], str] = {}
+        # LRU of metadata rows by file path, for reselecting the same files.
+        # Guarded by _lock; writers evict the paths they change
+        self._metadata_cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        # (frozenset of criteria items, order_by, descending, columns) -> (version, time, rows); see search_files_cached
+        self._search_result_cache: 'OrderedDict[frozenset, Tuple[int, float, List[sqlite3.Row]]]' = OrderedDict()
         self._init_database()
-    
+
+    @contextmanager
+    def _transaction(self, mode: str = "IMMEDIATE", bump_version: bool = True):
+        """Run the enclosed statements in a single explicit transaction"""
+        # Commits bump version so screens and cached searches know to reload;
+        # writes to tables none of them read (settings, TEMP staging) pass
+        # bump_version=False
+        with self._lock:
+            cursor = self.conn.cursor()
+            # IMMEDIATE takes the write lock up front so a busy database is
+            # waited on at BEGIN rather than failing mid-transaction
+            cursor.execute(f"BEGIN {mode}")
+            try:
+                yield cursor
+            except BaseException:
+                try:
+                    cursor.execute("ROLLBACK")
+                except sqlite3.Error as rollback_error:
+                    # SQLite may already have rolled back (e.g. on SQLITE_FULL);
+                    # log it and surface the error that caused the rollback
+                    self.logger.error(f"Rollback failed: {rollback_error}")
+                raise
+            else:
+                cursor.execute("COMMIT")
+                if bump_version:
+                    self.version += 1
+
+    def _fetchall(self, sql: str, params: Iterable[Any] = ()) -> List[sqlite3.Row]:
+        """Run a read query under the connection lock and return all rows"""
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def _fetchone(self, sql: str, params: Iterable[Any] = ()) -> Optional[sqlite3.Row]:
+        """Run a read query under the connection lock and return the first row"""
+        with self._lock:
+            return self.conn.execute(sql, params).fetchone()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self.conn.close()
+            self._search_sql_cache.clear()
+            self._metadata_cache.clear()
+            self._search_result_cache.clear()
+
     def _init_database(self):
         """Initialize the database and create tables if they don't exist"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            # WAL persists in the database file; the rest are per connection.
+            # With synchronous=NORMAL in WAL mode commits don't fsync, so an
+            # OS crash or power loss can drop the last committed transaction
+            # (never corrupt the file); readers also never block the writer.
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA temp_store=MEMORY")
+            self.conn.execute("PRAGMA cache_size=-64000")
+            self.conn.execute("PRAGMA mmap_size=268435456")
+            # Wait for another process's write lock instead of failing at once
+            self.conn.execute("PRAGMA busy_timeout=5000")
+            
+            with self._transaction() as cursor:
                 
                 # Create files_metadata table
-                cursor.execute('''
+                cursor.execute(f'''
                     CREATE TABLE IF NOT EXISTS files_metadata (
                         file_id INTEGER PRIMARY KEY AUTOINCREMENT,
                         file_path TEXT NOT NULL,
@@ -31,8 +260,8 @@ class DatabaseManager:
                         equipment_included TEXT,
                         notes TEXT,
                         todos TEXT,
-                        last_modified DATETIME,
-                        created_date DATETIME DEFAULT CURRENT_TIMESTAMP
+                        last_modified REAL,
+                        created_date REAL DEFAULT {_NOW_EPOCH_SQL}
                     )
                 ''')
                 
@@ -45,6 +274,51 @@ class DatabaseManager:
                     )
                 ''')
                 
+                # Keep only the 5 most recent folders; an UPSERT that updates
+                # an existing row doesn't grow the table, so inserts suffice
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS trg_recent_trim
+                    AFTER INSERT ON recent_folders
+                    BEGIN
+                        DELETE FROM recent_folders
+                        WHERE folder_path NOT IN (
+                            SELECT folder_path
+                            FROM recent_folders
+                            ORDER BY last_accessed DESC
+                            LIMIT 5
+                        );
+                    END
+                ''')
+                
+                # Last seen mtime of each scanned directory; lets the scanner
+                # skip files of directories whose entries haven't changed
+                # Keyed by path alone, so WITHOUT ROWID stores each row in
+                # the primary key b-tree instead of a table plus an index
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS dir_snapshots (
+                        dir_path TEXT PRIMARY KEY,
+                        mtime REAL NOT NULL
+                    ) WITHOUT ROWID
+                ''')
+                cursor.execute(
+                    "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+                    ('dir_snapshots',)
+                )
+                if 'WITHOUT ROWID' not in cursor.fetchone()[0].upper():
+                    # Older databases created it as a rowid table; copy across
+                    cursor.execute('''
+                        CREATE TABLE dir_snapshots_new (
+                            dir_path TEXT PRIMARY KEY,
+                            mtime REAL NOT NULL
+                        ) WITHOUT ROWID
+                    ''')
+                    cursor.execute('''
+                        INSERT INTO dir_snapshots_new (dir_path, mtime)
+                        SELECT dir_path, mtime FROM dir_snapshots
+                    ''')
+                    cursor.execute("DROP TABLE dir_snapshots")
+                    cursor.execute("ALTER TABLE dir_snapshots_new RENAME TO dir_snapshots")
+                
                 # Create user_input_history table
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS user_input_history (
@@ -63,106 +337,499 @@ class DatabaseManager:
                         last_accessed DATETIME DEFAULT CURRENT_TIMESTAMP
                     )
                 ''')
-                
-                conn.commit()
-                self.logger.info("Database initialized successfully")
+
+                # Indexes for search filters; NOCASE matches LIKE semantics
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_files_path
+                    ON files_metadata(file_path COLLATE NOCASE)
+                ''')
+                # Unique binary index: one row per path, used for exact path
+                # lookups, folder range scans and the scanner's UPSERT.
+                # Older databases may hold duplicate paths; keep the first.
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+                    ('idx_files_path_unique',)
+                )
+                if cursor.fetchone() is None:
+                    cursor.execute('''
+                        DELETE FROM files_metadata WHERE file_id NOT IN (
+                            SELECT MIN(file_id) FROM files_metadata GROUP BY file_path
+                        )
+                    ''')
+                    cursor.execute("DROP INDEX IF EXISTS idx_files_path_exact")
+                    cursor.execute('''
+                        CREATE UNIQUE INDEX idx_files_path_unique
+                        ON files_metadata(file_path)
+                    ''')
+                # File times are stored as epoch seconds (REAL); databases
+                # written before that hold local ISO strings, converted once
+                cursor.execute("PRAGMA user_version")
+                if cursor.fetchone()[0] < 1:
+                    for column in ('last_modified', 'created_date'):
+                        cursor.execute(f'''
+                            UPDATE files_metadata
+                            SET {column} = {_epoch_sql(column)}
+                            WHERE typeof({column}) = 'text'
+                        ''')
+                    cursor.execute("PRAGMA user_version = 1")
+                # Scans look paths up through idx_files_path_unique; this
+                # extra path index served no query, so drop it where present
+                cursor.execute("DROP INDEX IF EXISTS idx_files_path_mtime")
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_files_type
+                    ON files_metadata(file_type COLLATE NOCASE)
+                ''')
+                # Department and file type are the search form's list-picked
+                # filters; one index answers either department alone or both
+                cursor.execute("DROP INDEX IF EXISTS idx_files_department")
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_files_department_type
+                    ON files_metadata(department COLLATE NOCASE, file_type COLLATE NOCASE)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_files_last_modified
+                    ON files_metadata(last_modified)
+                ''')
+                # Binary-collated indexes for the search screen's other
+                # common sort orders; file_path sorts on idx_files_path_unique
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_files_name
+                    ON files_metadata(file_name)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_files_created_date
+                    ON files_metadata(created_date)
+                ''')
+                # Whether the essential fields are filled in, computed by SQLite
+                # so "untagged files" is an index lookup. Generated columns
+                # need SQLite 3.31+; older libraries go without it
+                if sqlite3.sqlite_version_info >= (3, 31):
+                    cursor.execute("PRAGMA table_xinfo(files_metadata)")
+                    if 'is_fully_tagged' not in {row['name'] for row in cursor.fetchall()}:
+                        cursor.execute(f'''
+                            ALTER TABLE files_metadata ADD COLUMN is_fully_tagged INTEGER
+                            GENERATED ALWAYS AS ({_FULLY_TAGGED_SQL}) VIRTUAL
+                        ''')
+                    cursor.execute('''
+                        CREATE INDEX IF NOT EXISTS idx_files_fully_tagged
+                        ON files_metadata(is_fully_tagged)
+                    ''')
+                # One record per field value so usage counts can be upserted;
+                # duplicates in older databases are merged into the first
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+                    ('idx_input_history_field_unique',)
+                )
+                if cursor.fetchone() is None:
+                    cursor.execute('''
+                        UPDATE user_input_history SET usage_count = (
+                            SELECT SUM(h.usage_count) FROM user_input_history h
+                            WHERE h.field_name = user_input_history.field_name
+                              AND h.field_value = user_input_history.field_value
+                        )
+                        WHERE input_id IN (
+                            SELECT MIN(input_id) FROM user_input_history
+                            GROUP BY field_name, field_value HAVING COUNT(*) > 1
+                        )
+                    ''')
+                    cursor.execute('''
+                        DELETE FROM user_input_history WHERE input_id NOT IN (
+                            SELECT MIN(input_id) FROM user_input_history
+                            GROUP BY field_name, field_value
+                        )
+                    ''')
+                    cursor.execute("DROP INDEX IF EXISTS idx_input_history_field")
+                    cursor.execute('''
+                        CREATE UNIQUE INDEX idx_input_history_field_unique
+                        ON user_input_history(field_name, field_value)
+                    ''')
+
+            self._fts_enabled = self._init_search_index()
+
+            # Refresh planner statistics; the limit keeps ANALYZE to a
+            # bounded sample per index, so startup stays fast on big tables
+            self.conn.execute("PRAGMA analysis_limit=1000")
+            self.conn.execute("ANALYZE")
+
+            self.logger.info("Database initialized successfully")
         
         except sqlite3.Error as e:
             self.logger.error(f"Database initialization error: {e}")
             raise
     
+    def _init_search_index(self) -> bool:
+        """Create the files_fts index and its sync triggers; False if FTS5 is unavailable"""
+        columns = ', '.join(_FTS_COLUMNS)
+        new_values = ', '.join(f"new.{c}" for c in _FTS_COLUMNS)
+        old_values = ', '.join(f"old.{c}" for c in _FTS_COLUMNS)
+        try:
+            with self._transaction() as cursor:
+                cursor.execute("SELECT name FROM pragma_table_info('files_fts')")
+                indexed = tuple(row[0] for row in cursor.fetchall())
+                exists = bool(indexed)
+                if exists and indexed != _FTS_COLUMNS:
+                    # Indexed columns changed; rebuild the table and triggers
+                    for trigger in ('files_fts_ai', 'files_fts_ad', 'files_fts_au'):
+                        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+                    cursor.execute("DROP TABLE files_fts")
+                    exists = False
+
+                # External content table: only the index is stored, rows are
+                # read back from files_metadata by file_id
+                cursor.execute(f'''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+                        {columns},
+                        content='files_metadata',
+                        content_rowid='file_id',
+                        tokenize='trigram'
+                    )
+                ''')
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS files_fts_ai
+                    AFTER INSERT ON files_metadata BEGIN
+                        INSERT INTO files_fts (rowid, {columns})
+                        VALUES (new.file_id, {new_values});
+                    END
+                ''')
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS files_fts_ad
+                    AFTER DELETE ON files_metadata BEGIN
+                        INSERT INTO files_fts (files_fts, rowid, {columns})
+                        VALUES ('delete', old.file_id, {old_values});
+                    END
+                ''')
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS files_fts_au
+                    AFTER UPDATE OF {columns} ON files_metadata BEGIN
+                        INSERT INTO files_fts (files_fts, rowid, {columns})
+                        VALUES ('delete', old.file_id, {old_values});
+                        INSERT INTO files_fts (rowid, {columns})
+                        VALUES (new.file_id, {new_values});
+                    END
+                ''')
+
+                # Index rows written before the table existed
+                if not exists:
+                    cursor.execute("INSERT INTO files_fts (files_fts) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError as e:
+            self.logger.warning(f"Full-text search index unavailable, using LIKE scans: {e}")
+            return False
+
     def add_file_metadata(self, metadata: Dict[str, Any]) -> Optional[int]:
         """Add new file metadata to the database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                columns = ', '.join(metadata.keys())
-                placeholders = ', '.join(['?' for _ in metadata])
-                sql = f'INSERT INTO files_metadata ({columns}) VALUES ({placeholders})'
-                cursor.execute(sql, list(metadata.values()))
-                conn.commit()
+            _check_columns(metadata)
+            values = [metadata.get(c) for c in FILE_METADATA_COLUMNS]
+            with self._transaction() as cursor:
+                cursor.execute(_INSERT_SQL, values)
+                self._metadata_cache.pop(metadata.get('file_path'), None)
                 return cursor.lastrowid
-        except sqlite3.Error as e:
+        except (sqlite3.Error, ValueError) as e:
             self.logger.error(f"Error adding file metadata: {e}")
             return None
+
+    def sync_scanned_files(
+        self,
+        folder_path: str,
+        rows: Iterable[Tuple],
+        dir_mtimes: Optional[Dict[str, float]] = None,
+        unchanged_dirs: Iterable[str] = (),
+        batch_size: int = 1000
+    ) -> Tuple[int, int, List[str]]:
+        """Merge a folder scan into files_metadata; returns (seen, changed, removed paths)"""
+        # Rows are staged in temp.scan_seen, upserted, then anti-joined against
+        # the stored files under the folder, so no per-path state lives in Python.
+        # dir_mtimes and unchanged_dirs are only read once rows is exhausted;
+        # files directly inside an unchanged dir (given with its trailing
+        # separator) were not listed, so they're not reported as removed.
+        lower, upper = self._path_range(folder_path)
+        try:
+            with self._lock:
+                self.conn.execute(f'''
+                    CREATE TEMP TABLE IF NOT EXISTS scan_seen (
+                        file_path TEXT PRIMARY KEY,
+                        {', '.join(FILE_SCAN_COLUMNS[1:])}
+                    )
+                ''')
+                self.conn.execute("DELETE FROM temp.scan_seen")
+
+            # Staging flushes one batch per short transaction. The folder is
+            # walked between batches without holding the connection lock, and
+            # only TEMP tables are written, so other callers aren't blocked
+            seen = 0
+            rows = iter(rows)
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                with self._transaction("DEFERRED", bump_version=False) as cursor:
+                    cursor.executemany(_STAGE_SCAN_SQL, batch)
+                seen += len(batch)
+
+            # Only files_metadata changes are visible, so the version is
+            # bumped below when the merge actually changed rows
+            with self._transaction(bump_version=False) as cursor:
+                cursor.execute(_UPSERT_SCAN_SQL)
+                changed = cursor.rowcount
+                if changed:
+                    self._metadata_cache.clear()
+
+                cursor.execute(
+                    "CREATE TEMP TABLE IF NOT EXISTS scan_unchanged (dir_prefix TEXT PRIMARY KEY)"
+                )
+                cursor.execute("DELETE FROM temp.scan_unchanged")
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO temp.scan_unchanged (dir_prefix) VALUES (?)",
+                    ((prefix,) for prefix in unchanged_dirs)
+                )
+
+                cursor.execute('''
+                    SELECT m.file_path FROM files_metadata m
+                    LEFT JOIN temp.scan_seen s ON s.file_path = m.file_path
+                    WHERE s.file_path IS NULL
+                    AND m.file_path >= ? AND m.file_path < ?
+                    AND substr(m.file_path, 1, length(m.file_path) - length(m.file_name))
+                        NOT IN (SELECT dir_prefix FROM temp.scan_unchanged)
+                ''', (lower, upper))
+                removed = [row[0] for row in cursor.fetchall()]
+
+                if dir_mtimes is not None:
+                    # Replace the folder's snapshots so deleted or unreadable
+                    # directories are fully rescanned next time
+                    cursor.execute(
+                        "DELETE FROM dir_snapshots WHERE dir_path = ? OR (dir_path >= ? AND dir_path < ?)",
+                        (folder_path, lower, upper)
+                    )
+                    cursor.executemany(
+                        "INSERT OR REPLACE INTO dir_snapshots (dir_path, mtime) VALUES (?, ?)",
+                        dir_mtimes.items()
+                    )
+
+                cursor.execute("DELETE FROM temp.scan_seen")
+                cursor.execute("DELETE FROM temp.scan_unchanged")
+            if changed:
+                with self._lock:
+                    self.version += 1
+            return seen, changed, removed
+        except sqlite3.Error as e:
+            self.logger.error(f"Error syncing scanned files for {folder_path}: {e}")
+            return 0, 0, []
     
+    @staticmethod
+    def _update_statement(key_column: str, metadata: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        """UPDATE text and values for the fields given; None clears a field"""
+        _check_columns(metadata)
+        if not metadata:
+            raise ValueError("No metadata fields to update")
+        # Sorted so each set of fields maps to one SQL string, which the
+        # sqlite3 statement cache then reuses; untouched columns aren't
+        # written, so the files_fts trigger only sees real changes
+        columns = tuple(sorted(metadata))
+        return _update_sql(key_column, columns), [metadata[c] for c in columns]
+
     def update_file_metadata(self, file_id: int, metadata: Dict[str, Any]) -> bool:
         """Update existing file metadata"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                set_clause = ', '.join([f"{k} = ?" for k in metadata.keys()])
-                sql = f'UPDATE files_metadata SET {set_clause} WHERE file_id = ?'
-                values = list(metadata.values()) + [file_id]
-                cursor.execute(sql, values)
-                conn.commit()
+            sql, values = self._update_statement('file_id', metadata)
+            with self._transaction() as cursor:
+                cursor.execute(sql, values + [file_id])
+                # The id's path isn't known here, so drop every cached row
+                self._metadata_cache.clear()
                 return True
-        except sqlite3.Error as e:
+        except (sqlite3.Error, ValueError) as e:
             self.logger.error(f"Error updating file metadata: {e}")
             return False
     
-    def search_files(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Search files based on metadata criteria"""
+    def search_files(
+        self,
+        criteria: Dict[str, Any],
+        order_by: str = 'last_modified',
+        descending: bool = True,
+        columns: Optional[Tuple[str, ...]] = None
+    ) -> Iterator[Any]:
+        """Search files based on metadata criteria, streaming sqlite3.Row results or tuples of columns"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
-                where_clauses = []
-                values = []
+            # order_by and columns are interpolated into the SQL like the criteria keys
+            _check_columns((order_by,) + (columns or ()))
+            where_sql, values = self._search_where(criteria)
                 
-                # Handle each search criterion
-                for key, value in criteria.items():
-                    if not value:
-                        continue
-                        
-                    # Handle date fields
-                    if key in ('last_modified', 'created_date'):
-                        if value == "YYYY-MM-DD":
-                            continue
-                        # Allow partial date matches (e.g., just the date portion)
-                        where_clauses.append(f"date({key}) = date(?)")
-                        values.append(value)
-                    else:
-                        # Convert user's wildcard (*) to SQL wildcard (%)
-                        if '*' in value:
-                            value = value.replace('*', '%')
-                        else:
-                            # If no wildcard, wrap with % for partial matches
-                            value = f"%{value}%"
-                            
-                        # For text fields, use case-insensitive LIKE
-                        where_clauses.append(f"lower({key}) LIKE lower(?)")
-                        values.append(value)
+            # Build the SQL query; file_id keeps ties in a stable order
+            direction = 'DESC' if descending else 'ASC'
+            select = ', '.join(columns) if columns else '*'
+            sql = (
+                f"SELECT {select} FROM files_metadata{where_sql} "
+                f"ORDER BY {order_by} {direction}, file_id {direction}"
+            )
                 
-                # Build the SQL query
-                sql = "SELECT * FROM files_metadata"
-                if where_clauses:
-                    sql += " WHERE " + " AND ".join(where_clauses)
-                sql += " ORDER BY last_modified DESC"
-                
-                self.logger.debug(f"Executing search query: {sql} with values: {values}")
-                cursor.execute(sql, values)
-                results = [dict(row) for row in cursor.fetchall()]
-                self.logger.info(f"Search returned {len(results)} results")
-                return results
-                
-        except sqlite3.Error as e:
+            self.logger.debug(f"Executing search query: {sql} with values: {values}")
+            if columns:
+                yield from self._stream(sql, values, row_factory=None)
+            else:
+                yield from self._stream(sql, values)
+        except (sqlite3.Error, ValueError) as e:
+            # Re-raised so callers can tell a failed search from no matches,
+            # and search_files_cached never stores a partial result
             self.logger.error(f"Database error in search_files: {e}")
-            return []
-    
+            raise
+
+    def search_files_list(
+        self,
+        criteria: Dict[str, Any],
+        order_by: str = 'last_modified',
+        descending: bool = True,
+        columns: Optional[Tuple[str, ...]] = None
+    ) -> List[Any]:
+        """Search files based on metadata criteria, returning every result at once"""
+        return list(self.search_files(criteria, order_by, descending, columns))
+
+    def search_files_cached(
+        self,
+        criteria: Dict[str, Any],
+        order_by: str = 'last_modified',
+        descending: bool = True,
+        columns: Optional[Tuple[str, ...]] = None
+    ) -> List[Any]:
+        """Search files, reusing the last results for the same criteria if nothing was written since"""
+        key = (frozenset(criteria.items()), order_by, descending, columns)
+        cache = self._search_result_cache
+        with self._lock:
+            cached = cache.get(key)
+            # Any committed write bumps version, so a match means the rows
+            # are still current; the TTL bounds how long they're held
+            if (cached is not None and cached[0] == self.version
+                    and time.monotonic() - cached[1] < _SEARCH_RESULT_TTL):
+                cache.move_to_end(key)
+                return cached[2]
+            rows = self.search_files_list(criteria, order_by, descending, columns)
+            cache[key] = (self.version, time.monotonic(), rows)
+            cache.move_to_end(key)
+            while len(cache) > _SEARCH_RESULT_CACHE_SIZE:
+                cache.popitem(last=False)
+            return rows
+
+    def search_files_columns(self, criteria: Dict[str, Any], columns: Tuple[str, ...]) -> Iterator[Tuple]:
+        """Search files, streaming plain tuples of only the requested columns"""
+        try:
+            _check_columns(columns)
+            where_sql, values = self._search_where(criteria)
+            sql = f"SELECT {', '.join(columns)} FROM files_metadata{where_sql}"
+            # Plain tuples here rather than the connection's sqlite3.Row
+            yield from self._stream(sql, values, row_factory=None)
+        except (sqlite3.Error, ValueError) as e:
+            self.logger.error(f"Database error in search_files_columns: {e}")
+
+    def _stream(
+        self,
+        sql: str,
+        values: Iterable[Any],
+        row_factory: Optional[Any] = sqlite3.Row
+    ) -> Iterator[Any]:
+        """Yield a query's rows, fetched in batches under the connection lock"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = row_factory
+        cursor.arraysize = 1000
+        with self._lock:
+            cursor.execute(sql, values)
+            rows = cursor.fetchmany()
+        while rows:
+            yield from rows
+            with self._lock:
+                rows = cursor.fetchmany()
+
+    def _search_where(self, criteria: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        """Build the WHERE clause and bound values for search criteria"""
+        # Keys are interpolated into the SQL, so only known columns pass
+        _check_columns(criteria)
+        # Clauses are bucketed so cheap indexed predicates come first and
+        # the LIKE scans last: equality, date ranges, full-text, then LIKE
+        terms = []
+            
+        # Handle each search criterion
+        for key, value in criteria.items():
+            if not value:
+                continue
+                    
+            # Handle date fields
+            if key in ('last_modified', 'created_date'):
+                if value == "YYYY-MM-DD":
+                    continue
+                # Match the whole local day as an epoch range so the index can be used
+                terms.append((1, key, (value, value)))
+            elif key in _EXACT_MATCH_COLUMNS and '*' not in value:
+                # Values picked from a fixed list; NOCASE equality hits the index
+                terms.append((0, key, (value,)))
+            elif (self._fts_enabled and key in _FTS_COLUMNS
+                  and not any(c in value for c in '\\%_')):
+                # FTS5 only uses the trigram index for LIKE without ESCAPE,
+                # so values with characters needing escapes take the LIKE path
+                terms.append((2, key, (self._like_pattern(value),)))
+            else:
+                terms.append((3, key, (self._like_pattern(value),)))
+
+        if not terms:
+            return "", []
+        # Stable sort keeps the caller's order within each bucket
+        terms.sort(key=lambda term: term[0])
+        shape = tuple((kind, key) for kind, key, _ in terms)
+        values = [value for _, _, term_values in terms for value in term_values]
+
+        # A form only produces a handful of shapes, so the SQL text is built
+        # once per shape and the identical string hits the statement cache
+        where_sql = self._search_sql_cache.get(shape)
+        if where_sql is None:
+            clauses = [
+                _SEARCH_CLAUSES[kind].format(key=key) for kind, key in shape if kind != 2
+            ]
+            fts_keys = [key for kind, key in shape if kind == 2]
+            if fts_keys:
+                # All full-text terms go to one files_fts lookup, evaluated
+                # once into a rowid set the outer filters then probe, so
+                # the planner can't trade the index for an equality scan
+                clauses.insert(
+                    sum(1 for kind, _ in shape if kind < 2),
+                    "file_id IN (SELECT rowid FROM files_fts WHERE {})".format(
+                        ' AND '.join(f"{key} LIKE ?" for key in fts_keys)
+                    )
+                )
+            where_sql = " WHERE " + " AND ".join(clauses)
+            self._search_sql_cache[shape] = where_sql
+        return where_sql, values
+
+    def get_dir_snapshots(self, folder_path: str) -> Dict[str, float]:
+        """Get the stored mtime of a folder and every directory under it"""
+        lower, upper = self._path_range(folder_path)
+        try:
+            return dict(self._fetchall('''
+                SELECT dir_path, mtime FROM dir_snapshots
+                WHERE dir_path = ? OR (dir_path >= ? AND dir_path < ?)
+            ''', (folder_path, lower, upper)))
+        except sqlite3.Error as e:
+            self.logger.error(f"Error getting directory snapshots for {folder_path}: {e}")
+            return {}
+
+    @staticmethod
+    def _path_range(folder_path: str) -> Tuple[str, str]:
+        """Return the [lower, upper) file_path bounds for files under a folder"""
+        # Incrementing the trailing separator gives a half-open range that
+        # covers exactly the paths starting with prefix via the path index
+        prefix = folder_path if folder_path.endswith(('/', os.sep)) else folder_path + os.sep
+        return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+    @staticmethod
+    def _like_pattern(value: str) -> str:
+        """Convert a search term into a LIKE pattern with % and _ escaped"""
+        value = value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        if '*' in value:
+            # Convert user's wildcard (*) to SQL wildcard (%)
+            return value.replace('*', '%')
+        # If no wildcard, wrap with % for partial matches
+        return f"%{value}%"
+
     def get_recent_folders(self, limit: int = 5) -> List[Dict[str, Any]]:
         """Get list of recently accessed folders"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT * FROM recent_folders 
-                    ORDER BY last_accessed DESC 
-                    LIMIT ?
-                ''', (limit,))
-                return [dict(row) for row in cursor.fetchall()]
+            return [dict(row) for row in self._fetchall(_RECENT_FOLDERS_SQL, (limit,))]
         except sqlite3.Error as e:
             self.logger.error(f"Error getting recent folders: {e}")
             return []
@@ -170,10 +837,10 @@ class DatabaseManager:
     def add_recent_folder(self, folder_path: str) -> bool:
         """Add or update a folder in recent_folders table"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._transaction() as cursor:
                 
-                # Update if exists, insert if not
+                # Update if exists, insert if not; trg_recent_trim keeps
+                # only the 5 most recent after an insert
                 cursor.execute("""
                     INSERT INTO recent_folders (folder_path, last_accessed)
                     VALUES (?, CURRENT_TIMESTAMP)
@@ -181,33 +848,35 @@ class DatabaseManager:
                     DO UPDATE SET last_accessed = CURRENT_TIMESTAMP
                 """, (folder_path,))
                 
-                # Keep only the 5 most recent
-                cursor.execute("""
-                    DELETE FROM recent_folders 
-                    WHERE folder_path NOT IN (
-                        SELECT folder_path 
-                        FROM recent_folders 
-                        ORDER BY last_accessed DESC 
-                        LIMIT 5
-                    )
-                """)
-                
-                conn.commit()
                 return True
                 
         except sqlite3.Error as e:
             self.logger.error(f"Database error in add_recent_folder: {e}")
             return False
 
+    def touch_recent_folder_and_fetch(self, folder_path: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Mark a folder as just accessed and return the updated recent list in one transaction"""
+        try:
+            with self._transaction() as cursor:
+                cursor.execute("""
+                    INSERT INTO recent_folders (folder_path, last_accessed)
+                    VALUES (?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(folder_path) 
+                    DO UPDATE SET last_accessed = CURRENT_TIMESTAMP
+                """, (folder_path,))
+                cursor.execute(_RECENT_FOLDERS_SQL, (limit,))
+                return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error in touch_recent_folder_and_fetch: {e}")
+            return []
+
     def get_file_metadata(self, file_id: int) -> Optional[Dict[str, Any]]:
         """Get metadata for a specific file"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute('SELECT * FROM files_metadata WHERE file_id = ?', (file_id,))
-                row = cursor.fetchone()
-                return dict(row) if row else None
+            row = self._fetchone(
+                'SELECT * FROM files_metadata WHERE file_id = ?', (file_id,)
+            )
+            return dict(row) if row else None
         except sqlite3.Error as e:
             self.logger.error(f"Error getting file metadata: {e}")
             return None
@@ -215,13 +884,11 @@ class DatabaseManager:
     def remove_recent_folder(self, folder_path: str) -> bool:
         """Remove a folder from the recent_folders table"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._transaction() as cursor:
                 cursor.execute(
                     "DELETE FROM recent_folders WHERE folder_path = ?",
                     (folder_path,)
                 )
-                conn.commit()
                 return True
         except sqlite3.Error as e:
             self.logger.error(f"Error removing recent folder: {e}")
@@ -230,18 +897,13 @@ class DatabaseManager:
     def update_file_metadata_by_path(self, file_path: str, metadata: Dict[str, Any]) -> bool:
         """Update metadata for a file based on its path"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Build the update query
-                set_clause = ', '.join([f"{k} = ?" for k in metadata.keys()])
-                values = list(metadata.values()) + [file_path]
+            sql, values = self._update_statement('file_path', metadata)
+            with self._transaction() as cursor:
                 
-                sql = f'UPDATE files_metadata SET {set_clause} WHERE file_path = ?'
-                self.logger.debug(f"Executing update query: {sql} with values: {values}")
+                self.logger.debug(f"Updating metadata for {file_path} with values: {metadata}")
                 
-                cursor.execute(sql, values)
-                conn.commit()
+                cursor.execute(sql, values + [file_path])
+                self._metadata_cache.pop(file_path, None)
                 
                 if cursor.rowcount > 0:
                     self.logger.info(f"Successfully updated metadata for {file_path}")
@@ -250,33 +912,84 @@ class DatabaseManager:
                     self.logger.warning(f"No rows updated for {file_path}")
                     return False
                     
-        except sqlite3.Error as e:
+        except (sqlite3.Error, ValueError) as e:
             self.logger.error(f"Database error updating metadata for {file_path}: {e}")
             return False
 
+    def bulk_update_metadata(self, file_paths: Iterable[str], metadata: Dict[str, Any]) -> int:
+        """Apply the same metadata to many files in one transaction, returning the rows updated"""
+        file_paths = list(file_paths)
+        try:
+            sql, values = self._update_statement('file_path', metadata)
+            with self._transaction() as cursor:
+                cursor.executemany(
+                    sql,
+                    (values + [file_path] for file_path in file_paths)
+                )
+                for file_path in file_paths:
+                    self._metadata_cache.pop(file_path, None)
+                self.logger.info(f"Updated metadata for {cursor.rowcount} files")
+                return cursor.rowcount
+        except (sqlite3.Error, ValueError) as e:
+            self.logger.error(f"Database error in bulk metadata update: {e}")
+            return 0
+
     def get_file_metadata_by_path(self, file_path: str) -> Optional[Dict[str, Any]]:
         """Get metadata for a file based on its path"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute('SELECT * FROM files_metadata WHERE file_path = ?', (file_path,))
-                row = cursor.fetchone()
-                return dict(row) if row else None
-        except sqlite3.Error as e:
-            self.logger.error(f"Error getting file metadata for {file_path}: {e}")
-            return None
+        return self.get_metadata_for_paths([file_path]).get(file_path)
+
+    def get_metadata_for_paths(
+        self,
+        file_paths: Iterable[str],
+        batch_size: int = 500
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get metadata for many files at once, keyed by file path (cached; don't modify)"""
+        file_paths = list(file_paths)
+        metadata = {}
+        cache = self._metadata_cache
+        # Held throughout so a write can't evict a path between our read
+        # of it and caching the result
+        with self._lock:
+            missing = []
+            for file_path in file_paths:
+                cached = cache.get(file_path)
+                if cached is None:
+                    missing.append(file_path)
+                else:
+                    cache.move_to_end(file_path)
+                    metadata[file_path] = cached
+            try:
+                # Plain tuples zipped with the column names once per batch
+                # build each dict directly, without a sqlite3.Row in between
+                cursor = self.conn.cursor()
+                cursor.row_factory = None
+                # Batched to stay under SQLite's bound parameter limit
+                for start in range(0, len(missing), batch_size):
+                    batch = missing[start:start + batch_size]
+                    placeholders = ', '.join('?' * len(batch))
+                    cursor.execute(
+                        f'SELECT * FROM files_metadata WHERE file_path IN ({placeholders})',
+                        batch
+                    )
+                    names = [column[0] for column in cursor.description]
+                    path_index = names.index('file_path')
+                    for row in cursor:
+                        metadata[row[path_index]] = cache[row[path_index]] = dict(zip(names, row))
+            except sqlite3.Error as e:
+                self.logger.error(f"Error getting file metadata for {len(file_paths)} paths: {e}")
+            while len(cache) > _METADATA_CACHE_SIZE:
+                cache.popitem(last=False)
+        return metadata
 
     def set_last_selected_folder(self, folder_path: str) -> bool:
         """Store or update the last selected folder path"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            # Not shown anywhere, so screens and cached searches stay valid
+            with self._transaction(bump_version=False) as cursor:
                 cursor.execute("""
                     INSERT OR REPLACE INTO last_selected_folder (id, folder_path, last_accessed)
                     VALUES (1, ?, CURRENT_TIMESTAMP)
                 """, (folder_path,))
-                conn.commit()
                 return True
         except sqlite3.Error as e:
             self.logger.error(f"Error setting last selected folder: {e}")
@@ -285,11 +998,10 @@ class DatabaseManager:
     def get_last_selected_folder(self) -> Optional[str]:
         """Get the last selected folder path"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT folder_path FROM last_selected_folder WHERE id = 1")
-                result = cursor.fetchone()
-                return result[0] if result else None
+            result = self._fetchone(
+                "SELECT folder_path FROM last_selected_folder WHERE id = 1"
+            )
+            return result[0] if result else None
         except sqlite3.Error as e:
             self.logger.error(f"Error getting last selected folder: {e}")
             return None
\ No newline at end of file
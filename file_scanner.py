@@ -1,10 +1,16 @@
 import os
-from pathlib import Path
-from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import logging
-from typing import Dict, List, Optional, Set
+import threading
+from typing import Dict, Iterator, List, Tuple
 import sqlite3
-from config import FILE_TYPES
+from config import FILE_TYPES, SCAN_BATCH_SIZE, SCAN_WORKERS
+
+# Bound once; FILE_TYPES keys are already lowercase extensions
+_file_type_for = FILE_TYPES.get
+
+class ScanStopped(Exception):
+    """Raised inside a scan's walk once FileScanner.stop() has been called"""
 
 class FileScanner:
     """Handles scanning of folders and updating the metadata database."""
@@ -13,6 +19,12 @@ class FileScanner:
         """Initialize the FileScanner with a database manager instance."""
         self.db_manager = db_manager
         self.logger = logging.getLogger('app.file_scanner')
+        # Set at shutdown so a running walk ends instead of finishing the tree
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        """Make any running scan, and every later one, end early without syncing"""
+        self._stop_event.set()
         
     def scan_folder(self, folder_path: str) -> bool:
         """
@@ -30,107 +42,209 @@ class FileScanner:
                 self.logger.error(f"Folder not found: {folder_path}")
                 return False
                 
-            # Get existing files in database for this folder
-            existing_files = self._get_existing_files(folder_path)
-            
-            # Track processed files to identify removed ones
-            processed_files: Set[str] = set()
-            
-            # Scan all files in folder and subfolders
-            for root, _, files in os.walk(folder_path):
-                for filename in files:
-                    file_path = os.path.join(root, filename)
-                    
-                    try:
-                        # Get file metadata
-                        metadata = self._extract_metadata(file_path)
-                        
-                        if file_path in existing_files:
-                            # Update existing record if modified
-                            if metadata['last_modified'] > existing_files[file_path]:
-                                self.db_manager.update_file_metadata(
-                                    file_path,
-                                    metadata
-                                )
-                                self.logger.debug(f"Updated metadata: {file_path}")
-                        else:
-                            # Add new record
-                            self.db_manager.add_file_metadata(metadata)
-                            self.logger.debug(f"Added new file: {file_path}")
-                            
-                        processed_files.add(file_path)
-                        
-                    except Exception as e:
-                        self.logger.error(f"Error processing file {file_path}: {e}")
-                        continue
+            # Directories whose mtime matches the last scan have the same
+            # entries, so their files are not stat'ed or re-synced
+            snapshots = self.db_manager.get_dir_snapshots(folder_path)
+            dir_mtimes = {}
+            unchanged_dirs = []
+
+            # Stream every file row into SQLite; new paths are inserted,
+            # modified ones refreshed, and unseen stored paths returned
+            rows = self._iter_file_rows(folder_path, snapshots, dir_mtimes, unchanged_dirs)
+            processed, changed, removed_files = self.db_manager.sync_scanned_files(
+                folder_path,
+                rows,
+                dir_mtimes,
+                unchanged_dirs,
+                batch_size=SCAN_BATCH_SIZE
+            )
             
-            # Identify and handle removed files
-            removed_files = set(existing_files.keys()) - processed_files
+            # Handle files that were removed from disk
             if removed_files:
                 self._handle_removed_files(removed_files)
             
             self.logger.info(
-                f"Scan completed - Processed: {len(processed_files)}, "
-                f"Removed: {len(removed_files)}"
+                f"Scan completed - Processed: {processed}, "
+                f"Added or updated: {changed}, Removed: {len(removed_files)}"
             )
             return True
             
+        except ScanStopped:
+            # Nothing was merged; the staged rows are discarded by the next scan
+            self.logger.info(f"Scan stopped for folder: {folder_path}")
+            return False
         except Exception as e:
             self.logger.error(f"Scan failed for folder {folder_path}: {e}")
             return False
-            
-    def _extract_metadata(self, file_path: str) -> Dict:
+
+    def _iter_file_rows(
+        self,
+        folder_path: str,
+        snapshots: Dict[str, float],
+        dir_mtimes: Dict[str, float],
+        unchanged_dirs: List[str]
+    ) -> Iterator[Tuple]:
         """
-        Extract metadata from a file.
+        Walk a folder and yield a metadata row for every file found.
         
         Args:
-            file_path (str): Path to the file
+            folder_path (str): Path to the folder to scan
+            snapshots (Dict[str, float]): Directory mtimes from the last scan
+            dir_mtimes (Dict[str, float]): Filled with the mtime of every directory listed
+            unchanged_dirs (List[str]): Filled with the prefixes of skipped directories
             
-        Returns:
-            Dict: Metadata dictionary
+        Yields:
+            Tuple: Metadata row in FILE_SCAN_COLUMNS order
         """
-        file_stat = os.stat(file_path)
-        file_name = os.path.basename(file_path)
-        extension = os.path.splitext(file_name)[1].lower()
+        # Scan all files in folder and subfolders
+        walk = self._walk_files(folder_path, snapshots, dir_mtimes, unchanged_dirs)
+        for file_path, file_stat in walk:
+            try:
+                # Get file metadata
+                row = self._extract_metadata(file_path, file_stat)
+            except Exception as e:
+                self.logger.error(f"Error processing file {file_path}: {e}")
+                continue
+
+            yield row
+
+    def _walk_files(
+        self,
+        folder_path: str,
+        snapshots: Dict[str, float],
+        dir_mtimes: Dict[str, float],
+        unchanged_dirs: List[str]
+    ) -> Iterator[Tuple[str, os.stat_result]]:
+        """
+        Yield the path and stat result of every file under a folder.
         
-        metadata = {
-            'file_path': file_path,
-            'file_name': file_name,
-            'source': Path(file_path).drive or 'local',
-            'file_type': FILE_TYPES.get(extension, 'OTHER'),
-            'last_modified': datetime.fromtimestamp(file_stat.st_mtime),
-            'created_date': datetime.fromtimestamp(file_stat.st_ctime)
-        }
+        Folders are listed and their files stat'ed by a pool of worker
+        threads, since this I/O is latency bound on network drives. Rows are
+        consumed on the calling thread, which stays the only database writer.
         
-        return metadata
+        A directory's mtime only changes when entries are added, removed or
+        renamed, so a directory matching its snapshot is still listed for
+        subfolders but its files are skipped.
         
-    def _get_existing_files(self, folder_path: str) -> Dict[str, datetime]:
+        Args:
+            folder_path (str): Path to the folder to walk
+            snapshots (Dict[str, float]): Directory mtimes from the last scan
+            dir_mtimes (Dict[str, float]): Filled with the mtime of every directory listed
+            unchanged_dirs (List[str]): Filled with the prefixes of skipped directories
+            
+        Yields:
+            Tuple[str, os.stat_result]: File path and its stat result
+            
+        Raises:
+            ScanStopped: If stop() is called during the walk
+        """
+        try:
+            root_mtime = os.stat(folder_path).st_mtime
+        except OSError as e:
+            self.logger.error(f"Error reading folder {folder_path}: {e}")
+            return
+
+        executor = ThreadPoolExecutor(max_workers=SCAN_WORKERS)
+
+        def submit(directory: str, mtime: float):
+            skip_files = snapshots.get(directory) == mtime
+            future = executor.submit(self._scan_directory, directory, skip_files)
+            pending[future] = (directory, mtime, skip_files)
+
+        try:
+            pending = {}
+            submit(folder_path, root_mtime)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    # Checked per directory; raising, rather than ending the
+                    # walk, keeps a partial tree from being synced as complete
+                    if self._stop_event.is_set():
+                        raise ScanStopped(folder_path)
+                    directory, mtime, skip_files = pending.pop(future)
+                    files, subfolders, complete = future.result()
+                    if complete:
+                        dir_mtimes[directory] = mtime
+                        if skip_files:
+                            unchanged_dirs.append(os.path.join(directory, ''))
+                    for subfolder, subfolder_mtime in subfolders:
+                        submit(subfolder, subfolder_mtime)
+                    yield from files
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _scan_directory(
+        self,
+        directory: str,
+        skip_files: bool = False
+    ) -> Tuple[List[Tuple[str, os.stat_result]], List[Tuple[str, float]], bool]:
         """
-        Get existing files from database for the given folder.
+        List a single folder, returning its files with stat results and its subfolders.
+        
+        os.scandir reports the file type with the directory listing (and on
+        Windows the stat data too), so no separate os.stat call is needed.
         
         Args:
-            folder_path (str): Path to the folder
+            directory (str): Path to the folder to list
+            skip_files (bool): Only list subfolders, leaving files out
             
         Returns:
-            Dict[str, datetime]: Dictionary of file paths and their last modified times
+            Tuple[List[Tuple[str, os.stat_result]], List[Tuple[str, float]], bool]:
+                Files, subfolders with their mtimes, and whether every entry was read
         """
+        files = []
+        subfolders = []
+        complete = True
         try:
-            results = self.db_manager.search_files({'file_path': folder_path})
-            return {
-                r['file_path']: r['last_modified'] 
-                for r in results 
-                if 'file_path' in r and 'last_modified' in r
-            }
-        except sqlite3.Error as e:
-            self.logger.error(f"Database error getting existing files: {e}")
-            return {}
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            # Like os.walk, don't descend into linked folders
+                            if not entry.is_symlink():
+                                subfolders.append((entry.path, entry.stat().st_mtime))
+                        elif not skip_files:
+                            files.append((entry.path, entry.stat()))
+                    except OSError as e:
+                        complete = False
+                        self.logger.error(f"Error processing file {entry.path}: {e}")
+        except OSError as e:
+            complete = False
+            self.logger.error(f"Error reading folder {directory}: {e}")
+        return files, subfolders, complete
+            
+    def _extract_metadata(self, file_path: str, file_stat: os.stat_result) -> Tuple:
+        """
+        Extract metadata from a file.
+        
+        Args:
+            file_path (str): Path to the file
+            file_stat (os.stat_result): Stat result already fetched for the file
             
-    def _handle_removed_files(self, removed_files: Set[str]) -> None:
+        Returns:
+            Tuple: Metadata row in FILE_SCAN_COLUMNS order
+        """
+        file_name = os.path.split(file_path)[1]
+        # rpartition is cheaper than splitext; an empty stem means a
+        # dotfile or no extension, matching splitext's behaviour
+        stem, _, extension = file_name.rpartition('.')
+        file_type = _file_type_for('.' + extension.lower(), 'OTHER') if stem else 'OTHER'
+
+        return (
+            file_path,
+            file_name,
+            os.path.splitdrive(file_path)[0] or 'local',
+            file_type,
+            file_stat.st_mtime,
+            file_stat.st_ctime
+        )
+        
+    def _handle_removed_files(self, removed_files: List[str]) -> None:
         """
         Handle files that no longer exist in the folder.
         
         Args:
-            removed_files (Set[str]): Set of file paths that were not found
+            removed_files (List[str]): File paths that were not found
         """
         try:
             # For now, we'll just log removed files
@@ -152,22 +266,30 @@ class FileScanner:
             Dict: Summary statistics
         """
         try:
-            results = self.db_manager.search_files({'file_path': folder_path})
-            
-            # Count files by type
+            # Only the columns needed for the counts, streamed as tuples
+            results = self.db_manager.search_files_columns(
+                {'file_path': folder_path},
+                ('file_type', 'department', 'revision')
+            )
+
+            total = 0
+            tagged = 0
             type_counts = {}
-            for result in results:
-                file_type = result.get('file_type', 'OTHER')
+            for file_type, department, revision in results:
+                total += 1
+
+                # Count files by type
                 type_counts[file_type] = type_counts.get(file_type, 0) + 1
-                
-            # Count tagged vs untagged
-            tagged = sum(1 for r in results if r.get('department') and r.get('revision'))
-            
+
+                # Count tagged vs untagged
+                if department and revision:
+                    tagged += 1
+
             return {
-                'total_files': len(results),
+                'total_files': total,
                 'type_counts': type_counts,
                 'tagged_files': tagged,
-                'untagged_files': len(results) - tagged
+                'untagged_files': total - tagged
             }
             
         except sqlite3.Error as e:
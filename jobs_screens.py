@@ -4,6 +4,10 @@ import ttkbootstrap as ttk
 from datetime import datetime
 import logging
 import os
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+from config import FOLDER_EXISTS_CACHE_TTL
 
 class JobsScreen(ttk.Frame):
     """Screen for managing folders and recent history"""
@@ -11,8 +15,8 @@ class JobsScreen(ttk.Frame):
         super().__init__(parent)
         self.controller = controller
         self.logger = logging.getLogger(f'app.{self.__class__.__name__.lower()}')
+        self._exists_cache: Dict[str, Tuple[float, bool]] = {}
         self._create_widgets()
-        self.refresh()
 
     def _create_widgets(self):
         # Configure grid weights for resizing
@@ -95,6 +99,16 @@ class JobsScreen(ttk.Frame):
         
         self.recent_tree.bind('<Double-1>', self._on_recent_folder_selected)
 
+    def _path_exists(self, path: str) -> bool:
+        """os.path.exists, remembering each answer for a couple of seconds"""
+        now = time.monotonic()
+        cached = self._exists_cache.get(path)
+        if cached is not None and now - cached[0] < FOLDER_EXISTS_CACHE_TTL:
+            return cached[1]
+        exists = os.path.exists(path)
+        self._exists_cache[path] = (now, exists)
+        return exists
+
     def _open_folder(self):
         """Handle opening a folder"""
         folder_path = filedialog.askdirectory(title="Select Folder")
@@ -105,18 +119,26 @@ class JobsScreen(ttk.Frame):
             return
 
         self.controller.current_folder = folder_path
-        self.refresh()
         self.controller.refresh_all_screens()
 
     def _process_folder(self, folder_path: str) -> bool:
         """Process a selected folder"""
         try:
-            # Update recent folders
-            self.controller.db.add_recent_folder(folder_path)
+            # Update recent folders and redraw the list from the same transaction
+            recent_folders = self.controller.db.touch_recent_folder_and_fetch(folder_path)
+            self.refresh(recent_folders)
+            self.controller.mark_screen_refreshed("jobs")
             
-            # Scan folder contents
+            # Scan folder contents on the controller's worker thread; the
+            # screens are refreshed again once the scan has finished
             if self.controller.scanner:
-                self.controller.scanner.scan_folder(folder_path)
+                future = self.controller.executor.submit(
+                    self.controller.scanner.scan_folder,
+                    folder_path
+                )
+                future.add_done_callback(
+                    lambda f: self._on_scan_finished(folder_path, f)
+                )
             
             self.logger.info(f"Successfully processed folder: {folder_path}")
             return True
@@ -129,6 +151,42 @@ class JobsScreen(ttk.Frame):
             )
             return False
 
+    def _on_scan_finished(self, folder_path: str, future: Future):
+        """Hand a finished background scan back to the Tk thread"""
+        # A scan stopped at shutdown finishes after Tk is gone
+        if future.cancelled() or self.controller.closing:
+            return
+        try:
+            self.after(0, self._on_scan_done, folder_path, future)
+        except (RuntimeError, tk.TclError):
+            # The window closed between the check and the call
+            pass
+
+    def _on_scan_done(self, folder_path: str, future: Future):
+        """Report a background scan's result and refresh the screens"""
+        try:
+            scanned = future.result()
+        except Exception as e:
+            self.logger.error(f"Error scanning folder {folder_path}: {e}")
+            scanned = False
+
+        if scanned:
+            self.logger.info(f"Finished scanning folder: {folder_path}")
+        else:
+            messagebox.showerror(
+                "Scan Error",
+                f"Error scanning folder:\n{folder_path}"
+            )
+
+        # The user may be editing on the metadata screen by now, so only its
+        # file list is updated; a full refresh would drop their selection
+        # and unsaved field values
+        metadata_screen = self.controller.screens.get("metadata")
+        if metadata_screen is not None:
+            metadata_screen.reload_files()
+            self.controller.mark_screen_refreshed("metadata")
+        self.controller.refresh_all_screens()
+
     def _on_recent_folder_selected(self, event):
         """Handle double-click on recent folder"""
         selection = self.recent_tree.selection()
@@ -139,7 +197,7 @@ class JobsScreen(ttk.Frame):
         folder_path = self.recent_tree.item(selection[0])['values'][0]
         self.logger.info(f"Selected folder from recent list: {folder_path}")
 
-        if not os.path.exists(folder_path):
+        if not self._path_exists(folder_path):
             self.logger.warning(f"Recent folder not found: {folder_path}")
             messagebox.showwarning(
                 "Folder Not Found",
@@ -156,24 +214,38 @@ class JobsScreen(ttk.Frame):
         self.logger.info(f"Processing selected folder: {folder_path}")
         if self._process_folder(folder_path):
             self.controller.current_folder = folder_path
-            self.refresh()
             self.controller.refresh_all_screens()
             self.logger.info(f"Switching to metadata screen for folder: {folder_path}")
             self.controller.show_screen("metadata")
 
-    def refresh(self):
-        """Refresh the recent folders list"""
-        for item in self.recent_tree.get_children():
-            self.recent_tree.delete(item)
+    def refresh(self, recent_folders: Optional[List[Dict[str, Any]]] = None):
+        """Refresh the recent folders list, fetching it unless already given"""
+        if recent_folders is None:
+            recent_folders = self.controller.db.get_recent_folders()
 
-        recent_folders = self.controller.db.get_recent_folders()
+        # Rows are keyed by folder path so only changed entries touch Tk
+        rows = {}
         for folder in recent_folders:
-            self.recent_tree.insert(
-                '',
-                'end',
-                values=(
-                    folder['folder_path'],
-                    folder['last_accessed'].strftime('%Y-%m-%d %H:%M')
-                )
+            rows[folder['folder_path']] = (
+                folder['folder_path'],
+                folder['last_accessed'].strftime('%Y-%m-%d %H:%M')
             )
-        self.logger.info("Recent folders list refreshed")
\ No newline at end of file
+
+        stale = [item for item in self.recent_tree.get_children() if item not in rows]
+        if stale:
+            self.recent_tree.delete(*stale)
+
+        # Mirror of the tree order, kept in step with each insert/move
+        current = list(self.recent_tree.get_children())
+        for index, (folder_path, values) in enumerate(rows.items()):
+            if folder_path not in current:
+                self.recent_tree.insert('', index, iid=folder_path, values=values)
+                current.insert(index, folder_path)
+                continue
+            if self.recent_tree.item(folder_path, 'values') != values:
+                self.recent_tree.item(folder_path, values=values)
+            if current.index(folder_path) != index:
+                self.recent_tree.move(folder_path, '', index)
+                current.remove(folder_path)
+                current.insert(index, folder_path)
+        self.logger.info("Recent folders list refreshed")
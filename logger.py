@@ -1,9 +1,11 @@
 import sqlite3
 import logging
+import queue
 import sys
+import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from logging.handlers import TimedRotatingFileHandler
+from typing import List, Dict, Any, Optional, Tuple
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from config import LOG_DIR, LOG_BACKUP_COUNT, LOG_ROTATION
 
 class DatabaseManager:
@@ -134,13 +136,38 @@ class DatabaseManager:
             self.logger.error(f"Error getting recent projects: {e}")
             return []
 
-def setup_logging() -> logging.Logger:
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that runs strftime for asctime at most once per second"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_second = None
+        self._cached_time = ''
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_second = second
+            self._cached_time = time.strftime(self.default_time_format, self.converter(second))
+        return self.default_msec_format % (self._cached_time, record.msecs)
+
+def setup_logging() -> Tuple[logging.Logger, QueueListener]:
     """
     Set up application logging with file and console handlers.
     
+    Records are put on a queue by the calling thread and written to the
+    handlers by a background QueueListener, so logging from the GUI thread
+    never waits on file I/O. Stop the listener on shutdown to flush it.
+    
     Returns:
-        logging.Logger: Configured logger instance
+        Tuple[logging.Logger, QueueListener]: Configured logger and its started listener
     """
+    # Skip collecting thread/process details the formats never use
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
     # Create logs directory if it doesn't exist
     LOG_DIR.mkdir(parents=True, exist_ok=True)
     
@@ -149,7 +176,7 @@ def setup_logging() -> logging.Logger:
     logger.setLevel(logging.DEBUG)
     
     # Create formatters
-    file_formatter = logging.Formatter(
+    file_formatter = CachedTimeFormatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     console_formatter = logging.Formatter(
@@ -160,7 +187,8 @@ def setup_logging() -> logging.Logger:
     file_handler = TimedRotatingFileHandler(
         LOG_DIR / 'app.log',
         when=LOG_ROTATION,
-        backupCount=LOG_BACKUP_COUNT
+        backupCount=LOG_BACKUP_COUNT,
+        delay=True
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(file_formatter)
@@ -170,8 +198,15 @@ def setup_logging() -> logging.Logger:
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(console_formatter)
     
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # Only the queue handler is attached; the listener thread does the writes
+    log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(
+        log_queue,
+        file_handler,
+        console_handler,
+        respect_handler_level=True
+    )
+    listener.start()
     
-    return logger
\ No newline at end of file
+    return logger, listener
\ No newline at end of file
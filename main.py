@@ -7,14 +7,14 @@ and coordinating between different components of the system.
 """
 
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk, messagebox
 import ttkbootstrap as ttk
 from pathlib import Path
 import logging
 import sys
 import os
-from typing import Dict, Optional
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
 
 # Import application modules
 from db_manager import DatabaseManager
@@ -37,149 +37,11 @@ class Screen(ttk.Frame):
         """Refresh screen content - to be implemented by subclasses"""
         pass
 
-class JobsScreen(Screen):
-    """Screen for managing job folders and recent projects"""
-    def __init__(self, parent, controller):
-        super().__init__(parent, controller)
-        self._create_widgets()
-        self.refresh()
-
-    def _create_widgets(self):
-        # Title Section
-        title_frame = ttk.Frame(self)
-        title_frame.pack(fill='x', padx=20, pady=10)
-        
-        title_label = ttk.Label(
-            title_frame,
-            text="Folder Management",
-            font=("TkDefaultFont", 16, "bold")
-        )
-        title_label.pack(side='left')
-
-        # Folder Selection Section
-        folder_frame = ttk.LabelFrame(self, text="Open Folder", padding=10)
-        folder_frame.pack(fill='x', padx=20, pady=10)
-
-        open_btn = ttk.Button(
-            folder_frame,
-            text="Select Folder",
-            command=self._open_folder,
-            style='primary.TButton'
-        )
-        open_btn.pack(pady=5)
-
-        # Recent History Section
-        recent_frame = ttk.LabelFrame(self, text="Recent History", padding=10)
-        recent_frame.pack(fill='both', expand=True, padx=20, pady=10)
-
-        # Create Treeview for recent folders
-        self.recent_tree = ttk.Treeview(
-            recent_frame,
-            columns=('path', 'last_accessed'),
-            show='headings',
-            selectmode='browse',
-            height=5
-        )
-
-        self.recent_tree.heading('path', text='Folder Path')
-        self.recent_tree.heading('last_accessed', text='Last Accessed')
-        
-        self.recent_tree.column('path', width=300)
-        self.recent_tree.column('last_accessed', width=150)
-        
-        self.recent_tree.pack(fill='both', expand=True)
-        self.recent_tree.bind('<Double-1>', self._on_recent_folder_selected)
-
-    def _open_folder(self):
-        """Handle opening a folder"""
-        folder_path = filedialog.askdirectory(title="Select Folder")
-        if not folder_path:
-            return
-
-        if not self._process_folder(folder_path):
-            return
-
-        self.controller.current_folder = folder_path
-        self.refresh()
-        self.controller.refresh_all_screens()
-
-    def _process_folder(self, folder_path: str) -> bool:
-        """Process a selected folder"""
-        if not os.path.exists(folder_path):
-            self.logger.warning(f"Folder not found: {folder_path}")
-            messagebox.showwarning(
-                "Invalid Folder",
-                f"The folder does not exist:\n{folder_path}"
-            )
-            return False
-            
-        try:
-            # Update recent folders
-            self.controller.db.add_recent_folder(folder_path)
-            
-            # Scan folder contents
-            if self.controller.scanner:
-                self.controller.scanner.scan_folder(folder_path)
-            
-            self.logger.info(f"Successfully processed folder: {folder_path}")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Error processing folder {folder_path}: {e}")
-            messagebox.showerror(
-                "Processing Error",
-                f"Error processing folder:\n{str(e)}"
-            )
-            return False
-
-    def _on_recent_folder_selected(self, event):
-        """Handle double-click on recent folder"""
-        selection = self.recent_tree.selection()
-        if not selection:
-            return
-
-        folder_path = self.recent_tree.item(selection[0])['values'][0]
-        if not os.path.exists(folder_path):
-            self.logger.warning(f"Recent folder not found: {folder_path}")
-            messagebox.showwarning(
-                "Folder Not Found",
-                f"The folder no longer exists:\n{folder_path}"
-            )
-            return
-
-        if self._process_folder(folder_path):
-            self.controller.current_folder = folder_path
-            self.refresh()
-            self.controller.refresh_all_screens()
-            self.controller.show_screen("metadata")
-
-    def refresh(self):
-        """Refresh the recent folders list"""
-        for item in self.recent_tree.get_children():
-            self.recent_tree.delete(item)
-
-        recent_folders = self.controller.db.get_recent_folders()
-        for folder in recent_folders:
-            # Convert string timestamp to datetime if needed
-            last_accessed = folder['last_accessed']
-            if isinstance(last_accessed, str):
-                last_accessed = datetime.fromisoformat(last_accessed.replace('Z', '+00:00'))
-            
-            self.recent_tree.insert(
-                '',
-                'end',
-                values=(
-                    folder['folder_path'],
-                    last_accessed.strftime('%Y-%m-%d %H:%M')
-                )
-            )
-        self.logger.info("Recent folders list refreshed")
-
 class FileManagementSystem:
     """Main application class"""
     def __init__(self):
         # Initialize logger first
-        self.logger = setup_logging()
+        self.logger, self.log_listener = setup_logging()
         self.logger.info("Initializing File Management System")
 
         # Create main window
@@ -194,8 +56,15 @@ class FileManagementSystem:
         # Initialize database
         self.db = DatabaseManager()
         
-        # Initialize file scanner
+        # Initialize file scanner; scans run one at a time off the Tk thread
         self.scanner = FileScanner(self.db)
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        # Folder listings and other screen I/O get their own worker so
+        # they don't queue behind a long scan; see run_in_background
+        self.listing_executor = ThreadPoolExecutor(max_workers=1)
+        # Set once the main loop has ended; work finishing after that
+        # must not call back into Tk
+        self.closing = False
         
         # Track current folder - try to restore last used folder
         self.current_folder = self._restore_last_folder()
@@ -208,10 +77,17 @@ class FileManagementSystem:
         self.container.grid_rowconfigure(0, weight=1)
         self.container.grid_columnconfigure(0, weight=1)
 
-        # Initialize screens dictionary and navigation
+        # Initialize screens dictionary and navigation; screens are built
+        # on first show, so only the initial one is created at startup
         self.screens: Dict[str, Screen] = {}
+        self._screen_factories = {
+            "jobs": JobsScreen,
+            "search": SearchScreen,
+            "metadata": MetadataScreen
+        }
+        # Database version each screen last refreshed against
+        self._screen_versions: Dict[str, int] = {}
         self._setup_navigation()
-        self._initialize_screens()
 
         # Show initial screen
         self.show_screen("jobs")
@@ -244,28 +120,63 @@ class FileManagementSystem:
             )
             btn.grid(row=0, column=i, padx=5)
 
-    def _initialize_screens(self):
-        """Initialize all application screens"""
-        self.screens["jobs"] = JobsScreen(self.container, self)
-        self.screens["search"] = SearchScreen(self.container, self)
-        self.screens["metadata"] = MetadataScreen(self.container, self)
-
-        # Configure grid for all screens
-        for screen in self.screens.values():
+    def run_in_background(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        callback: Optional[Callable[[Future], None]] = None
+    ) -> Future:
+        """Run func on the listing worker, handing its Future to callback on the Tk thread"""
+        future = self.listing_executor.submit(func, *args)
+        if callback is not None:
+            def on_done(f: Future):
+                # Results arriving at shutdown are dropped; Tk may be gone by then
+                if f.cancelled() or self.closing:
+                    return
+                try:
+                    self.root.after(0, callback, f)
+                except (RuntimeError, tk.TclError):
+                    # The window closed between the check and the call
+                    pass
+            future.add_done_callback(on_done)
+        return future
+
+    def _get_screen(self, screen_name: str) -> Optional[Screen]:
+        """Return a screen, constructing it on first use"""
+        screen = self.screens.get(screen_name)
+        if screen is None:
+            factory = self._screen_factories.get(screen_name)
+            if factory is None:
+                return None
+            screen = factory(self.container, self)
             screen.grid(row=0, column=0, sticky="nsew")
+            self.screens[screen_name] = screen
+        return screen
 
-    def show_screen(self, screen_name: str):
+    def show_screen(self, screen_name: str, force: bool = False):
         """Switch to the specified screen"""
-        screen = self.screens.get(screen_name)
+        screen = self._get_screen(screen_name)
         if screen:
             screen.tkraise()
-            screen.refresh()  # Refresh the screen when it's shown
+            self._refresh_screen(screen_name, force)  # Refresh if data changed
             self.logger.info(f"Switched to {screen_name} screen")
 
-    def refresh_all_screens(self):
-        """Refresh all screens"""
-        for screen in self.screens.values():
-            screen.refresh()
+    def refresh_all_screens(self, force: bool = False):
+        """Refresh all screens built so far; the rest refresh on first show"""
+        for screen_name in self.screens:
+            self._refresh_screen(screen_name, force)
+
+    def mark_screen_refreshed(self, screen_name: str):
+        """Record that a screen refreshed itself against the current database"""
+        self._screen_versions[screen_name] = self.db.version
+
+    def _refresh_screen(self, screen_name: str, force: bool = False):
+        """Refresh a screen unless the database is unchanged since its last refresh"""
+        version = self.db.version
+        if not force and self._screen_versions.get(screen_name) == version:
+            return
+        self.screens[screen_name].refresh()
+        self._screen_versions[screen_name] = version
 
     def run(self):
         """Start the application"""
@@ -276,6 +187,14 @@ class FileManagementSystem:
             messagebox.showerror("Error", f"An error occurred:\n{str(e)}")
         finally:
             self.logger.info("Application shutting down")
+            self.closing = True
+            # Stop a running scan's walk, then let it finish its transaction
+            # before closing
+            self.scanner.stop()
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.listing_executor.shutdown(wait=True, cancel_futures=True)
+            self.db.close()
+            self.log_listener.stop()
 
 def main():
     """Main entry point"""
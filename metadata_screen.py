@@ -2,16 +2,55 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import ttkbootstrap as ttk
 import logging
-from typing import Dict, Any, List, Optional
+from concurrent.futures import Future
+from typing import Dict, Any, List, Optional, Tuple
 import sqlite3
-from config import METADATA_FIELDS, DEPARTMENTS
+from config import (
+    METADATA_FIELDS, DEPARTMENTS, FILTER_DEBOUNCE_MS, FILE_LIST_CHUNK_SIZE, RESIZE_DEBOUNCE_MS
+)
 import os
 
+# Marks a field whose value differs across the selected files
+_VARIES = object()
+
+# Editable fields in display order: (name, widget type, combobox values)
+_EDITOR_FIELDS = (
+    ("department", "combobox", DEPARTMENTS),
+    ("file_type", "entry", None),
+    ("revision", "entry", None),
+    ("drawing_type", "entry", None),
+    ("plant_area", "entry", None),
+    ("issue_status", "entry", None),
+    ("equipment_included", "entry", None),
+    ("notes", "text", None),
+    ("todos", "text", None),
+)
+
 class MetadataScreen(ttk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
         self.logger = logging.getLogger('app.metadata_screen')
+        # Bumped on every file list load so results of an older one are dropped
+        self._load_generation = 0
+        # Likewise for selection metadata lookups and refresh's last folder lookup
+        self._selection_generation = 0
+        self._refresh_generation = 0
+        # (iid, lowercased name) of every listed file, and the iids the
+        # filter has detached, so filtering needs no Treeview lookups
+        self._file_index: List[Tuple[str, str]] = []
+        self._hidden_files = set()
+        # Text the rows were last filtered by; None once rows have changed
+        self._filter_text: Optional[str] = ''
+        # iid -> (name, path, file_type, department, revision) of each row,
+        # read instead of round-tripping through file_list.item()
+        self._row_data: Dict[str, Tuple[str, ...]] = {}
+        # path -> (mtime, subfolder paths) of folders listed for the tree,
+        # reused when the tree is rebuilt on refresh
+        self._subfolder_cache: Dict[str, Tuple[float, List[str]]] = {}
+        self._last_size: Optional[Tuple[int, int]] = None
+        self._resize_job = None
+        self._filter_job = None
         self._create_widgets()
         
     def _create_widgets(self):
@@ -29,31 +68,31 @@ class MetadataScreen(ttk.Frame):
         total_width = self.winfo_width()
         
         # Left panel - Folder Tree (20% of width)
-        folder_frame = ttk.LabelFrame(self.main_paned, text="Folders")
-        self.main_paned.add(folder_frame, weight=20)
+        self.folder_frame = ttk.LabelFrame(self.main_paned, text="Folders")
+        self.main_paned.add(self.folder_frame, weight=20)
         
         # Configure folder frame grid
-        folder_frame.grid_rowconfigure(0, weight=1)
-        folder_frame.grid_columnconfigure(0, weight=1)
+        self.folder_frame.grid_rowconfigure(0, weight=1)
+        self.folder_frame.grid_columnconfigure(0, weight=1)
 
         # Create folder treeview
-        self.folder_tree = ttk.Treeview(folder_frame, show='tree')
-        folder_scroll = ttk.Scrollbar(folder_frame, orient="vertical", command=self.folder_tree.yview)
+        self.folder_tree = ttk.Treeview(self.folder_frame, show='tree')
+        folder_scroll = ttk.Scrollbar(self.folder_frame, orient="vertical", command=self.folder_tree.yview)
         self.folder_tree.configure(yscrollcommand=folder_scroll.set)
         
         self.folder_tree.grid(row=0, column=0, sticky='nsew')
         folder_scroll.grid(row=0, column=1, sticky='ns')
         
         # Middle panel - File List (50% of width)
-        file_frame = ttk.LabelFrame(self.main_paned, text="Files")
-        self.main_paned.add(file_frame, weight=50)
+        self.file_frame = ttk.LabelFrame(self.main_paned, text="Files")
+        self.main_paned.add(self.file_frame, weight=50)
         
         # Configure file frame grid
-        file_frame.grid_rowconfigure(1, weight=1)
-        file_frame.grid_columnconfigure(0, weight=1)
+        self.file_frame.grid_rowconfigure(1, weight=1)
+        self.file_frame.grid_columnconfigure(0, weight=1)
 
         # Search/Filter frame
-        filter_frame = ttk.Frame(file_frame)
+        filter_frame = ttk.Frame(self.file_frame)
         filter_frame.grid(row=0, column=0, columnspan=2, sticky='ew', padx=5, pady=5)
         filter_frame.grid_columnconfigure(1, weight=1)
         
@@ -64,7 +103,7 @@ class MetadataScreen(ttk.Frame):
 
         # File listbox with multiple selection
         self.file_list = ttk.Treeview(
-            file_frame,
+            self.file_frame,
             columns=('name', 'type', 'department', 'revision'),
             show='headings',
             selectmode='extended'
@@ -81,8 +120,8 @@ class MetadataScreen(ttk.Frame):
         self.file_list.column('department', width=120, minwidth=80)
         self.file_list.column('revision', width=80, minwidth=60)
         
-        file_scroll_y = ttk.Scrollbar(file_frame, orient="vertical", command=self.file_list.yview)
-        file_scroll_x = ttk.Scrollbar(file_frame, orient="horizontal", command=self.file_list.xview)
+        file_scroll_y = ttk.Scrollbar(self.file_frame, orient="vertical", command=self.file_list.yview)
+        file_scroll_x = ttk.Scrollbar(self.file_frame, orient="horizontal", command=self.file_list.xview)
         self.file_list.configure(yscrollcommand=file_scroll_y.set, xscrollcommand=file_scroll_x.set)
         
         self.file_list.grid(row=1, column=0, sticky='nsew')
@@ -90,20 +129,20 @@ class MetadataScreen(ttk.Frame):
         file_scroll_x.grid(row=2, column=0, sticky='ew')
 
         # Right panel - Metadata Editor (30% of width)
-        editor_frame = ttk.LabelFrame(self.main_paned, text="Edit Metadata")
-        self.main_paned.add(editor_frame, weight=30)
+        self.editor_frame = ttk.LabelFrame(self.main_paned, text="Edit Metadata")
+        self.main_paned.add(self.editor_frame, weight=30)
         
         # Configure editor frame grid
-        editor_frame.grid_rowconfigure(2, weight=1)
-        editor_frame.grid_columnconfigure(0, weight=1)
+        self.editor_frame.grid_rowconfigure(2, weight=1)
+        self.editor_frame.grid_columnconfigure(0, weight=1)
 
         # Selection info
-        self.selection_label = ttk.Label(editor_frame, text="No files selected")
+        self.selection_label = ttk.Label(self.editor_frame, text="No files selected")
         self.selection_label.grid(row=0, column=0, sticky='ew', padx=5, pady=5)
 
         # Create scrollable frame for metadata fields
-        canvas = ttk.Canvas(editor_frame)
-        scrollbar = ttk.Scrollbar(editor_frame, orient="vertical", command=canvas.yview)
+        canvas = ttk.Canvas(self.editor_frame)
+        scrollbar = ttk.Scrollbar(self.editor_frame, orient="vertical", command=canvas.yview)
         scrollable_frame = ttk.Frame(canvas)
 
         scrollable_frame.bind(
@@ -117,23 +156,15 @@ class MetadataScreen(ttk.Frame):
         # Metadata fields
         self.metadata_widgets = {}
         
-        # Add all metadata fields
-        self._add_field(scrollable_frame, "department", widget_type="combobox", values=DEPARTMENTS)
-        self._add_field(scrollable_frame, "file_type")
-        self._add_field(scrollable_frame, "revision")
-        self._add_field(scrollable_frame, "drawing_type")
-        self._add_field(scrollable_frame, "plant_area")
-        self._add_field(scrollable_frame, "issue_status")
-        self._add_field(scrollable_frame, "equipment_included")
-        self._add_field(scrollable_frame, "notes", widget_type="text")
-        self._add_field(scrollable_frame, "todos", widget_type="text")
+        # Add all metadata fields once the rest of the screen has been drawn
+        self.after_idle(self._add_fields, scrollable_frame)
 
         # Pack the canvas and scrollbar
         canvas.grid(row=2, column=0, sticky='nsew', padx=5)
         scrollbar.grid(row=2, column=1, sticky='ns')
 
         # Buttons
-        btn_frame = ttk.Frame(editor_frame)
+        btn_frame = ttk.Frame(self.editor_frame)
         btn_frame.grid(row=3, column=0, columnspan=2, sticky='ew', padx=5, pady=10)
         
         ttk.Button(
@@ -151,6 +182,7 @@ class MetadataScreen(ttk.Frame):
 
         # Bind events
         self.folder_tree.bind('<<TreeviewSelect>>', self._on_folder_selected)
+        self.folder_tree.bind('<<TreeviewOpen>>', self._expand_node)
         self.file_list.bind('<<TreeviewSelect>>', self._on_files_selected)
         
         # Configure canvas scrolling
@@ -161,7 +193,7 @@ class MetadataScreen(ttk.Frame):
         self.bind('<Configure>', self._on_resize)
 
     def _populate_folder_tree(self):
-        """Populate the folder tree with the current folder structure"""
+        """Populate the folder tree with the current folder and its subfolders"""
         self.logger.debug("Starting folder tree population")
         self.folder_tree.delete(*self.folder_tree.get_children())
         
@@ -169,36 +201,13 @@ class MetadataScreen(ttk.Frame):
             self.logger.warning("No current folder to populate")
             return
             
-        def add_folder(parent, path):
-            self.logger.debug(f"Adding folder to tree: {path}")
-            folder_name = os.path.basename(path) or path
-            folder_id = self.folder_tree.insert(
-                parent, 
-                'end', 
-                text=folder_name, 
-                values=(path,),
-                open=True  # Keep folders expanded
-            )
-            
-            try:
-                # Add subfolders
-                for item in os.scandir(path):
-                    if item.is_dir() and not item.name.startswith('.'):
-                        add_folder(folder_id, item.path)
-            except PermissionError:
-                self.logger.warning(f"Permission denied accessing folder: {path}")
-            except Exception as e:
-                self.logger.error(f"Error accessing folder {path}: {e}")
-            return folder_id  # Return the folder ID for verification
-            
         try:
-            # Add the root folder
+            # Add the root folder; deeper levels are listed when expanded
             self.logger.debug(f"Attempting to add root folder: {self.controller.current_folder}")
-            root_id = add_folder('', self.controller.current_folder)
-            if root_id:
-                self.logger.info(f"Successfully populated folder tree for: {self.controller.current_folder}")
-            else:
-                self.logger.error("Failed to create root folder in tree")
+            root_id = self._add_folder_node('', self.controller.current_folder)
+            self.folder_tree.item(root_id, open=True)
+            self._load_subfolders(root_id)
+            self.logger.info(f"Successfully populated folder tree for: {self.controller.current_folder}")
         except Exception as e:
             self.logger.error(f"Error populating folder tree: {e}")
             messagebox.showerror(
@@ -206,6 +215,88 @@ class MetadataScreen(ttk.Frame):
                 f"Failed to load folder structure:\n{str(e)}"
             )
 
+    def _add_folder_node(self, parent: str, path: str) -> str:
+        """Insert a folder with a placeholder child so it shows an expand arrow"""
+        folder_name = os.path.basename(path) or path
+        folder_id = self.folder_tree.insert(
+            parent,
+            'end',
+            text=folder_name,
+            values=(path,)
+        )
+        self.folder_tree.insert(folder_id, 'end', text='', tags=('placeholder',))
+        return folder_id
+
+    def _load_subfolders(self, folder_id: str):
+        """Replace a folder's placeholder with its immediate subfolders"""
+        if self._placeholder(folder_id) is None:
+            return  # Already listed
+        path = self.folder_tree.item(folder_id)['values'][0]
+        self._fill_subfolders(folder_id, self._list_subfolders(path))
+
+    def _placeholder(self, folder_id: str) -> Optional[str]:
+        """Return a folder's placeholder child if it hasn't been listed yet"""
+        children = self.folder_tree.get_children(folder_id)
+        if len(children) == 1 and self.folder_tree.tag_has('placeholder', children[0]):
+            return children[0]
+        return None
+
+    def _list_subfolders(self, path: str) -> List[str]:
+        """List a folder's visible subfolders; safe to run off the Tk thread"""
+        try:
+            # A folder's mtime changes whenever entries are added, removed or
+            # renamed, so a matching mtime means the cached listing still holds
+            mtime = os.stat(path).st_mtime
+            cached = self._subfolder_cache.get(path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+
+            subfolders = []
+            # Add subfolders; not following links answers is_dir from the
+            # listing itself and, like the scanner, leaves linked folders out
+            with os.scandir(path) as entries:
+                for item in entries:
+                    if not item.name.startswith('.') and item.is_dir(follow_symlinks=False):
+                        subfolders.append(item.path)
+            self._subfolder_cache[path] = (mtime, subfolders)
+            return subfolders
+        except PermissionError:
+            self.logger.warning(f"Permission denied accessing folder: {path}")
+        except Exception as e:
+            self.logger.error(f"Error accessing folder {path}: {e}")
+        return []
+
+    def _fill_subfolders(self, folder_id: str, subfolders: List[str]):
+        """Swap a folder's placeholder for nodes of its listed subfolders"""
+        placeholder = self._placeholder(folder_id)
+        if placeholder is None:
+            return
+        self.folder_tree.delete(placeholder)
+        for path in subfolders:
+            self._add_folder_node(folder_id, path)
+
+    def _expand_node(self, event):
+        """List a folder's subfolders in the background the first time it is expanded"""
+        folder_id = self.folder_tree.focus()
+        placeholder = self._placeholder(folder_id) if folder_id else None
+        if placeholder is None or self.folder_tree.tag_has('loading', placeholder):
+            return
+        self.folder_tree.item(placeholder, text='Loading...', tags=('placeholder', 'loading'))
+
+        path = self.folder_tree.item(folder_id)['values'][0]
+        self.controller.run_in_background(
+            self._list_subfolders,
+            path,
+            callback=lambda f: self._on_subfolders_listed(folder_id, f)
+        )
+
+    def _on_subfolders_listed(self, folder_id: str, future: Future):
+        """Add a background subfolder listing to the tree on the Tk thread"""
+        # The tree may have been rebuilt while the listing ran
+        if not self.folder_tree.exists(folder_id):
+            return
+        self._fill_subfolders(folder_id, future.result())
+
     def _on_folder_selected(self, event):
         """Handle folder selection"""
         selection = self.folder_tree.selection()
@@ -213,48 +304,198 @@ class MetadataScreen(ttk.Frame):
             return
             
         folder_path = self.folder_tree.item(selection[0])['values'][0]
-        # Store the selected folder path
-        self.controller.db.set_last_selected_folder(folder_path)
+        # Store the selected folder path without waiting on the database
+        self.controller.run_in_background(self.controller.db.set_last_selected_folder, folder_path)
         self._load_files(folder_path)
 
+    def _clear_file_list(self):
+        """Remove every file row, including ones hidden by the filter"""
+        self.file_list.delete(*(iid for iid, _ in self._file_index))
+        self._file_index = []
+        self._hidden_files = set()
+        self._filter_text = ''
+        self._row_data = {}
+        self._load_generation += 1  # Drop any file listing still in flight
+
     def _load_files(self, folder_path: str):
-        """Load files from the selected folder"""
-        self.file_list.delete(*self.file_list.get_children())
-        
+        """Load files from the selected folder in the background"""
+        self._clear_file_list()
+        generation = self._load_generation
+
+        self.controller.run_in_background(
+            self._list_files,
+            folder_path,
+            callback=lambda f: self._on_files_listed(folder_path, generation, f)
+        )
+
+    def _list_files(self, folder_path: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """List a folder's files with their metadata; runs off the Tk thread"""
+        with os.scandir(folder_path) as entries:
+            files = [(item.name, item.path) for item in entries if item.is_file()]
+        # One query for the whole folder instead of one per file
+        metadata_by_path = self.controller.db.get_metadata_for_paths(
+            path for _, path in files
+        )
+        return [(name, path, metadata_by_path.get(path, {})) for name, path in files]
+
+    def _on_files_listed(self, folder_path: str, generation: int, future: Future):
+        """Show a background file listing unless a newer load has started"""
+        if generation != self._load_generation:
+            return
         try:
-            for item in os.scandir(folder_path):
-                if item.is_file():
-                    metadata = self.controller.db.get_file_metadata(item.path) or {}
-                    self.file_list.insert(
-                        '',
-                        'end',
-                        values=(
-                            item.name,
-                            metadata.get('file_type', ''),
-                            metadata.get('department', ''),
-                            metadata.get('revision', '')
-                        ),
-                        tags=(item.path,)
-                    )
+            files = future.result()
         except Exception as e:
             self.logger.error(f"Error loading files from {folder_path}: {e}")
+            return
+
+        rows = [
+            (
+                (
+                    name,
+                    metadata.get('file_type') or '',
+                    metadata.get('department') or '',
+                    metadata.get('revision') or ''
+                ),
+                path
+            )
+            for name, path, metadata in files
+        ]
+
+        self._insert_file_rows(generation, rows, 0)
+
+    def reload_files(self):
+        """Re-list the shown folder's files, keeping the file selection and field inputs"""
+        selection = self.folder_tree.selection()
+        if not selection:
+            return
+        folder_path = self.folder_tree.item(selection[0])['values'][0]
+        # Stop any listing still being inserted; its missing rows are added
+        # by this one instead
+        self._load_generation += 1
+        generation = self._load_generation
+
+        self.controller.run_in_background(
+            self._list_files,
+            folder_path,
+            callback=lambda f: self._on_files_relisted(folder_path, generation, f)
+        )
+
+    def _on_files_relisted(self, folder_path: str, generation: int, future: Future):
+        """Update the file rows in place from a fresh listing"""
+        if generation != self._load_generation:
+            return
+        try:
+            files = future.result()
+        except Exception as e:
+            self.logger.error(f"Error reloading files from {folder_path}: {e}")
+            return
+
+        # Rows are updated rather than replaced, so the selection survives
+        iid_by_path = {data[1]: iid for iid, data in self._row_data.items()}
+        new_rows = []
+        for name, path, metadata in files:
+            values = (
+                name,
+                metadata.get('file_type') or '',
+                metadata.get('department') or '',
+                metadata.get('revision') or ''
+            )
+            iid = iid_by_path.pop(path, None)
+            if iid is None:
+                new_rows.append((values, path))
+                continue
+            data = (name, path) + values[1:]
+            if self._row_data[iid] != data:
+                self.file_list.item(iid, values=values)
+                self._row_data[iid] = data
+
+        # Whatever is left was deleted from disk since the last listing
+        gone = set(iid_by_path.values())
+        if gone:
+            self.file_list.delete(*gone)
+            self._file_index = [entry for entry in self._file_index if entry[0] not in gone]
+            self._hidden_files -= gone
+            for iid in gone:
+                del self._row_data[iid]
+
+        if new_rows:
+            self._insert_file_rows(generation, new_rows, 0)
+
+    def _insert_file_rows(self, generation: int, rows: List[Tuple[tuple, str]], start: int):
+        """Insert one chunk of file rows, scheduling the next when Tk is idle"""
+        # Stop if a newer load or a refresh cleared the list meanwhile
+        if generation != self._load_generation:
+            return
+        end = start + FILE_LIST_CHUNK_SIZE
+
+        # Hide the columns while inserting so the chunk is laid out once
+        display_columns = self.file_list['displaycolumns']
+        self.file_list.configure(displaycolumns=())
+        try:
+            insert = self.file_list.insert
+            file_index = self._file_index
+            row_data = self._row_data
+            for values, path in rows[start:end]:
+                iid = insert('', 'end', values=values)
+                name, file_type, department, revision = values
+                row_data[iid] = (name, path, file_type, department, revision)
+                file_index.append((iid, name.lower()))
+            # New rows haven't been through the filter yet
+            self._filter_text = None
+        finally:
+            self.file_list.configure(displaycolumns=display_columns)
+
+        if end < len(rows):
+            # Let Tk redraw and handle input between chunks
+            self.after_idle(self._insert_file_rows, generation, rows, end)
+        elif self.filter_entry.get():
+            # Keep any filter text already entered applied to the new rows
+            self._apply_filter()
 
     def _filter_files(self, event):
+        """Filter files once typing pauses rather than on every keystroke"""
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(FILTER_DEBOUNCE_MS, self._apply_filter)
+
+    def _apply_filter(self):
         """Filter files based on search text"""
+        self._filter_job = None
         search_text = self.filter_entry.get().lower()
-        
-        for item in self.file_list.get_children():
-            file_name = self.file_list.item(item)['values'][0].lower()
+        if search_text == self._filter_text:
+            return  # Rows already match this text
+        self._filter_text = search_text
+        hidden = self._hidden_files
+
+        # Only rows whose visibility changes are touched. Rows to hide are
+        # detached first, in a single Tk call, so that when rows are
+        # reattached position counts exactly the rows still attached ahead
+        # of them and they keep their listing order
+        to_hide = [
+            item for item, file_name in self._file_index
+            if search_text not in file_name and item not in hidden
+        ]
+        if to_hide:
+            self.file_list.detach(*to_hide)
+            hidden.update(to_hide)
+
+        position = 0
+        for item, file_name in self._file_index:
             if search_text in file_name:
-                self.file_list.reattach(item, '', 'end')
-            else:
-                self.file_list.detach(item)
+                if item in hidden:
+                    self.file_list.reattach(item, '', position)
+                    hidden.discard(item)
+                position += 1
 
     def _on_files_selected(self, event):
         """Handle file selection"""
         selection = self.file_list.selection()
         count = len(selection)
         
+        # Any lookup still running is for an older selection
+        self._selection_generation += 1
+        generation = self._selection_generation
+
         if count == 0:
             self.selection_label.config(text="No files selected")
             self._clear_fields()
@@ -262,45 +503,53 @@ class MetadataScreen(ttk.Frame):
         else:
             self.selection_label.config(text=f"{count} file{'s' if count > 1 else ''} selected")
 
-        # Get metadata for all selected files
-        metadata_list = []
-        for item in selection:
-            file_path = self.file_list.item(item)['tags'][0]
-            metadata = self.controller.db.get_file_metadata_by_path(file_path) or {}
-            metadata_list.append(metadata)
+        # Get metadata for all selected files in one query on the worker,
+        # so a scan holding the database doesn't stall the click
+        file_paths = [self._row_data[item][1] for item in selection]
+        self.controller.run_in_background(
+            self.controller.db.get_metadata_for_paths,
+            file_paths,
+            callback=lambda f: self._on_selection_metadata(generation, file_paths, f)
+        )
+
+    def _on_selection_metadata(self, generation: int, file_paths: List[str], future: Future):
+        """Fill the fields from a selection's metadata unless the selection has changed"""
+        if generation != self._selection_generation:
+            return
+        try:
+            metadata_by_path = future.result()
+        except Exception as e:
+            self.logger.error(f"Error loading metadata for selection: {e}")
+            return
+        metadata_list = [metadata_by_path.get(path, {}) for path in file_paths]
 
         # If no metadata found, clear fields and return
         if not metadata_list:
             self._clear_fields()
             return
 
-        # For each metadata field, check if all selected files have the same value
-        for field, widget in self.metadata_widgets.items():
-            # Get all values including empty strings for null/missing values
-            values = set(str(metadata.get(field, '')) for metadata in metadata_list)
-
-            # Update widget based on values
-            if len(values) == 1:
-                # All files have the same value (including all being empty)
-                value = values.pop()
-                if isinstance(widget, ttk.Text):
-                    widget.delete("1.0", tk.END)
-                    widget.insert("1.0", value)
-                elif isinstance(widget, ttk.Combobox):
-                    widget.set(value)
+        # One pass over the selection finds the value each field has in
+        # common; a field is dropped from the checks at its first mismatch
+        first = metadata_list[0]
+        common = {field: str(first.get(field) or '') for field in self.metadata_widgets}
+        undecided = list(common)
+        for metadata in metadata_list[1:]:
+            still_same = []
+            for field in undecided:
+                if str(metadata.get(field) or '') == common[field]:
+                    still_same.append(field)
                 else:
-                    widget.delete(0, tk.END)
-                    widget.insert(0, value)
-            else:
-                # Files have different values
-                if isinstance(widget, ttk.Text):
-                    widget.delete("1.0", tk.END)
-                    widget.insert("1.0", "varies")
-                elif isinstance(widget, ttk.Combobox):
-                    widget.set("varies")
-                else:
-                    widget.delete(0, tk.END)
-                    widget.insert(0, "varies")
+                    common[field] = _VARIES
+            undecided = still_same
+            if not undecided:
+                break
+
+        for field, widget in self.metadata_widgets.items():
+            # Files with different values show "varies"
+            value = common[field]
+            if value is _VARIES:
+                value = "varies"
+            self._set_widget_value(widget, value)
 
     def _update_selected(self):
         """Update metadata for all selected files"""
@@ -323,25 +572,31 @@ class MetadataScreen(ttk.Frame):
             messagebox.showwarning("No Changes", "Please enter metadata values to update")
             return
 
-        # Update each selected file
-        success_count = 0
-        error_count = 0
-        for item in selection:
-            file_path = self.file_list.item(item)['tags'][0]
-            try:
-                self.logger.debug(f"Updating metadata for {file_path} with values: {updates}")
-                if self.controller.db.update_file_metadata_by_path(file_path, updates):
-                    success_count += 1
-                else:
-                    error_count += 1
-                    self.logger.error(f"Failed to update metadata for {file_path}")
-            except Exception as e:
-                error_count += 1
-                self.logger.error(f"Error updating metadata for {file_path}: {e}")
+        # Update all selected files in one transaction on the worker; the
+        # database may be busy with a scan, so the Tk thread doesn't wait
+        file_paths = [self._row_data[item][1] for item in selection]
+        current_folder = self.folder_tree.item(self.folder_tree.selection()[0])['values'][0]
+        self.logger.debug(f"Updating metadata for {len(file_paths)} files with values: {updates}")
+        self.controller.run_in_background(
+            self.controller.db.bulk_update_metadata,
+            file_paths,
+            updates,
+            callback=lambda f: self._on_update_done(current_folder, len(file_paths), f)
+        )
+
+    def _on_update_done(self, folder_path: str, total: int, future: Future):
+        """Report a background metadata update and reload the file list"""
+        try:
+            success_count = future.result()
+        except Exception as e:
+            self.logger.error(f"Error updating metadata: {e}")
+            success_count = 0
+        error_count = total - success_count
+        if error_count:
+            self.logger.error(f"Failed to update metadata for {error_count} files")
 
         # Refresh the file list
-        current_folder = self.folder_tree.item(self.folder_tree.selection()[0])['values'][0]
-        self._load_files(current_folder)
+        self._load_files(folder_path)
 
         if error_count > 0:
             messagebox.showwarning(
@@ -357,19 +612,28 @@ class MetadataScreen(ttk.Frame):
     def _clear_fields(self):
         """Clear all metadata input fields"""
         for widget in self.metadata_widgets.values():
-            if isinstance(widget, ttk.Text):
+            self._set_widget_value(widget, '')
+
+    @staticmethod
+    def _set_widget_value(widget, value: str):
+        """Set a field widget's text, leaving it alone if already equal"""
+        if isinstance(widget, ttk.Text):
+            if widget.get("1.0", "end-1c") != value:
                 widget.delete("1.0", tk.END)
-            elif isinstance(widget, ttk.Combobox):
-                widget.set('')
-            else:
-                widget.delete(0, tk.END)
+                widget.insert("1.0", value)
+        elif isinstance(widget, ttk.Combobox):
+            if widget.get() != value:
+                widget.set(value)
+        elif widget.get() != value:
+            widget.delete(0, tk.END)
+            widget.insert(0, value)
 
     def refresh(self):
         """Refresh the screen"""
         self.logger.debug("Starting metadata screen refresh")
         # Clear existing data
         self._clear_fields()
-        self.file_list.delete(*self.file_list.get_children())
+        self._clear_file_list()
         
         # Populate folder tree if we have a current folder
         if self.controller.current_folder:
@@ -379,67 +643,92 @@ class MetadataScreen(ttk.Frame):
             if self.folder_tree.get_children():
                 self.logger.debug("Folder tree populated, selecting root item")
                 
-                # Try to get the last selected folder
-                last_folder = self.controller.db.get_last_selected_folder()
-                if last_folder and os.path.exists(last_folder):
-                    # Find and select the last used folder in the tree
-                    self.logger.debug(f"Attempting to restore last selected folder: {last_folder}")
-                    self._select_folder_in_tree(last_folder)
-                else:
-                    # If no last folder or it doesn't exist, select root
-                    root_item = self.folder_tree.get_children()[0]
-                    self.folder_tree.selection_set(root_item)
-                    self.folder_tree.see(root_item)
-                    
-                # Trigger folder selection to load files
-                self._on_folder_selected(None)
+                # Look up the last selected folder on the worker; the
+                # database read and exists check may wait on a scan
+                self._refresh_generation += 1
+                generation = self._refresh_generation
+                self.controller.run_in_background(
+                    self._find_last_folder,
+                    callback=lambda f: self._on_last_folder_found(generation, f)
+                )
             else:
                 self.logger.warning("No items in folder tree after population")
         else:
             self.logger.warning("No current folder set during refresh")
 
-    def _select_folder_in_tree(self, target_folder: str):
-        """Find and select a specific folder in the tree"""
-        def find_item(parent_item=''):
-            for item in self.folder_tree.get_children(parent_item):
-                item_path = self.folder_tree.item(item)['values'][0]
-                if item_path == target_folder:
-                    self.folder_tree.selection_set(item)
-                    self.folder_tree.see(item)
-                    return True
-                elif self.folder_tree.get_children(item):
-                    if find_item(item):
-                        return True
-            return False
-
-        # Start search from root
-        if not find_item():
-            # If folder not found, select root
+    def _find_last_folder(self) -> Optional[str]:
+        """The last selected folder if it still exists; runs off the Tk thread"""
+        last_folder = self.controller.db.get_last_selected_folder()
+        if last_folder and os.path.exists(last_folder):
+            return last_folder
+        return None
+
+    def _on_last_folder_found(self, generation: int, future: Future):
+        """Select the last used folder, or the root, and load its files"""
+        if generation != self._refresh_generation or not self.folder_tree.get_children():
+            return
+        if self.folder_tree.selection():
+            return  # The user picked a folder while the lookup ran
+        try:
+            last_folder = future.result()
+        except Exception as e:
+            self.logger.error(f"Error restoring last selected folder: {e}")
+            last_folder = None
+
+        if last_folder:
+            # Find and select the last used folder in the tree
+            self.logger.debug(f"Attempting to restore last selected folder: {last_folder}")
+            self._select_folder_in_tree(last_folder)
+        else:
+            # If no last folder or it doesn't exist, select root
             root_item = self.folder_tree.get_children()[0]
             self.folder_tree.selection_set(root_item)
             self.folder_tree.see(root_item)
+            
+        # Trigger folder selection to load files
+        self._on_folder_selected(None)
 
-    def _add_field(self, parent, field_name: str, widget_type: str = "entry", values: list = None):
-        """Helper method to add a metadata field"""
-        frame = ttk.Frame(parent)
-        frame.pack(fill='x', padx=5, pady=2)
-        
-        # Create label with capitalized field name
-        label = ttk.Label(frame, text=field_name.replace('_', ' ').title() + ":")
-        label.pack(side='left')
-        
-        # Create appropriate widget type
-        if widget_type == "combobox":
-            widget = ttk.Combobox(frame, values=values, state='readonly')
-            widget.pack(side='left', fill='x', expand=True, padx=5)
-        elif widget_type == "text":
-            widget = ttk.Text(frame, height=3, width=30)
-            widget.pack(side='left', fill='x', expand=True, padx=5)
-        else:  # Default to entry
-            widget = ttk.Entry(frame)
-            widget.pack(side='left', fill='x', expand=True, padx=5)
+    def _select_folder_in_tree(self, target_folder: str):
+        """Find and select a specific folder, expanding the tree down to it"""
+        item = self.folder_tree.get_children()[0]
+        item_path = self.folder_tree.item(item)['values'][0]
+        # Only the folders on the way to the target are listed
+        while item_path != target_folder:
+            self._load_subfolders(item)
+            self.folder_tree.item(item, open=True)
+            for child in self.folder_tree.get_children(item):
+                child_path = self.folder_tree.item(child)['values'][0]
+                if (target_folder == child_path
+                        or target_folder.startswith(os.path.join(child_path, ''))):
+                    item, item_path = child, child_path
+                    break
+            else:
+                # If folder not found, select root
+                item = self.folder_tree.get_children()[0]
+                break
+
+        self.folder_tree.selection_set(item)
+        self.folder_tree.see(item)
+
+    def _add_fields(self, parent):
+        """Add a label and input widget for every editable field, sharing one grid"""
+        parent.grid_columnconfigure(1, weight=1)
+        for row, (field_name, widget_type, values) in enumerate(_EDITOR_FIELDS):
+            # Create label with capitalized field name
+            label = ttk.Label(parent, text=field_name.replace('_', ' ').title() + ":")
             
-        self.metadata_widgets[field_name] = widget
+            # Create appropriate widget type
+            if widget_type == "combobox":
+                widget = ttk.Combobox(parent, values=values, state='readonly')
+            elif widget_type == "text":
+                widget = ttk.Text(parent, height=3, width=30)
+            else:  # Default to entry
+                widget = ttk.Entry(parent)
+
+            # Labels of multi-line fields sit level with their first line
+            label.grid(row=row, column=0, sticky='nw' if widget_type == "text" else 'w', padx=5, pady=2)
+            widget.grid(row=row, column=1, sticky='ew', padx=5, pady=2)
+            self.metadata_widgets[field_name] = widget
 
     def _bind_mousewheel(self, widget):
         """Bind mousewheel to scrolling"""
@@ -454,21 +743,21 @@ class MetadataScreen(ttk.Frame):
         widget.yview_scroll(int(-1*(event.delta/120)), "units")
 
     def _on_resize(self, event):
-        """Handle resize event"""
-        # Update pane sizes based on new window dimensions
-        self.update_idletasks()
-        total_width = self.winfo_width()
-        
-        # Left panel - Folder Tree (20% of width)
-        self.main_paned.configure(weights=(20, 50, 30))
-        folder_frame = self.main_paned.nametowidget(self.main_paned.identify(region='cell', x=0, y=0))
-        folder_frame.grid_columnconfigure(0, weight=1)
-        folder_frame.grid_columnconfigure(1, weight=1)
-        
-        # Middle panel - File List (50% of width)
-        file_frame = self.main_paned.nametowidget(self.main_paned.identify(region='cell', x=0, y=1))
-        file_frame.grid_columnconfigure(0, weight=1)
-        
-        # Right panel - Metadata Editor (30% of width)
-        editor_frame = self.main_paned.nametowidget(self.main_paned.identify(region='cell', x=0, y=2))
-        editor_frame.grid_columnconfigure(0, weight=1)
\ No newline at end of file
+        """Handle resize event once the size settles"""
+        # <Configure> also fires for moves and child changes; only a new
+        # size matters, and a drag produces many sizes in quick succession
+        size = (event.width, event.height)
+        if size == self._last_size:
+            return
+        self._last_size = size
+        if self._resize_job is not None:
+            self.after_cancel(self._resize_job)
+        self._resize_job = self.after(RESIZE_DEBOUNCE_MS, self._apply_resize)
+
+    def _apply_resize(self):
+        """Keep each panel's main column stretching with the window"""
+        self._resize_job = None
+        # Pane widths follow the weights given when the panes were added
+        self.folder_frame.grid_columnconfigure(0, weight=1)
+        self.file_frame.grid_columnconfigure(0, weight=1)
+        self.editor_frame.grid_columnconfigure(0, weight=1)
@@ -1,12 +1,22 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, ForeignKey, func
+from sqlalchemy import create_engine, event, text, Column, Computed, Integer, Float, String, DateTime, ForeignKey, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from typing import Optional
 import os
+import sqlite3
 
 Base = declarative_base()
 
+# Matches _NOW_EPOCH_SQL in db_manager.py: the current time in epoch seconds
+_NOW_EPOCH_SQL = "((julianday('now') - 2440587.5) * 86400.0)"
+
+# Matches _FULLY_TAGGED_SQL in db_manager.py
+_FULLY_TAGGED_SQL = (
+    "CASE WHEN trim(department) <> '' AND trim(revision) <> '' "
+    "AND trim(drawing_type) <> '' THEN 1 ELSE 0 END"
+)
+
 class FileMetadata(Base):
     """Model representing metadata for a file in the system."""
     __tablename__ = 'files_metadata'
@@ -24,22 +34,25 @@ class FileMetadata(Base):
     equipment_included = Column(String)
     notes = Column(String)
     todos = Column(String)
-    last_modified = Column(DateTime)
-    created_date = Column(DateTime, default=func.now())
+    # File times are stored as epoch seconds (REAL), as DatabaseManager writes them
+    last_modified = Column(Float)
+    created_date = Column(Float, server_default=text(_NOW_EPOCH_SQL))
+    # 1 when all essential metadata fields (department, revision,
+    # drawing_type) are populated; computed by SQLite, so it can be filtered on
+    is_fully_tagged = Column(
+        Integer,
+        Computed(_FULLY_TAGGED_SQL, persisted=False)
+    )
+
+    # Named as DatabaseManager creates them
+    __table_args__ = (
+        Index('idx_files_path_unique', 'file_path', unique=True),
+        Index('idx_files_fully_tagged', 'is_fully_tagged'),
+    )
 
     def __repr__(self):
         return f"<FileMetadata(file_id={self.file_id}, file_name='{self.file_name}')>"
 
-    @property
-    def is_fully_tagged(self) -> bool:
-        """Check if all essential metadata fields are populated."""
-        essential_fields = [
-            self.department,
-            self.revision,
-            self.drawing_type
-        ]
-        return all(field is not None and field.strip() != '' for field in essential_fields)
-
 class RecentProject(Base):
     """Model for tracking recently accessed project folders."""
     __tablename__ = 'recent_projects'
@@ -60,31 +73,64 @@ class UserInputHistory(Base):
     field_value = Column(String, nullable=False)
     usage_count = Column(Integer, default=1)  # For ranking autocomplete suggestions
 
+    # One record per field value; increment_usage upserts against it
+    __table_args__ = (
+        Index('idx_input_history_field_unique', 'field_name', 'field_value', unique=True),
+    )
+
     def __repr__(self):
         return f"<UserInputHistory(field='{self.field_name}', value='{self.field_value}')>"
 
     @classmethod
     def increment_usage(cls, session, field_name: str, field_value: str) -> None:
         """Increment usage count for a field value, creating new record if needed."""
-        record = session.query(cls).filter_by(
-            field_name=field_name,
-            field_value=field_value
-        ).first()
-
-        if record:
-            record.usage_count += 1
-        else:
-            new_record = cls(
-                field_name=field_name,
-                field_value=field_value,
-                usage_count=1
-            )
-            session.add(new_record)
+        session.execute(
+            text(
+                "INSERT INTO user_input_history (field_name, field_value, usage_count) "
+                "VALUES (:field_name, :field_value, 1) "
+                "ON CONFLICT (field_name, field_value) "
+                "DO UPDATE SET usage_count = usage_count + 1"
+            ),
+            {"field_name": field_name, "field_value": field_value}
+        )
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Apply the same connection settings DatabaseManager uses."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
 
 def init_db(db_path: str = "fms.db") -> None:
     """Initialize the database and create all tables."""
     engine = create_engine(f'sqlite:///{db_path}')
+    # WAL lets readers run alongside the single writer, e.g. the scanner
+    event.listen(engine, 'connect', _set_sqlite_pragmas)
     Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        # create_all doesn't add columns to existing tables; add the
+        # generated column as DatabaseManager does (SQLite 3.31+ only)
+        if (sqlite3.sqlite_version_info >= (3, 31)
+                and 'is_fully_tagged' not in _table_columns(connection, 'files_metadata')):
+            connection.execute(text(
+                "ALTER TABLE files_metadata ADD COLUMN is_fully_tagged INTEGER "
+                f"GENERATED ALWAYS AS ({_FULLY_TAGGED_SQL}) VIRTUAL"
+            ))
+        # Likewise add any indexes missing from databases created before
+        # they were declared, skipping ones whose columns aren't there
+        for table in Base.metadata.sorted_tables:
+            columns = _table_columns(connection, table.name)
+            for index in table.indexes:
+                if all(column.name in columns for column in index.columns):
+                    index.create(connection, checkfirst=True)
+
+def _table_columns(connection, table_name: str) -> set:
+    """Names of a table's columns, including generated ones"""
+    rows = connection.execute(text(f"PRAGMA table_xinfo({table_name})"))
+    return {row[1] for row in rows}
 
 # Example usage:
 if __name__ == "__main__":
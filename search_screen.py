@@ -2,9 +2,19 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import ttkbootstrap as ttk
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 import sqlite3
-from config import METADATA_FIELDS, DEPARTMENTS, SEARCH_RESULTS_PER_PAGE, FILE_TYPES
+from concurrent.futures import Future
+from config import METADATA_FIELDS, DEPARTMENTS, SEARCH_RESULTS_PER_PAGE, SEARCH_DEBOUNCE_MS, FILE_TYPE_CHOICES
+from utils import format_timestamp
+
+# Fields fetched for the results tree, in column order; the two dates
+# come last so the rest pass straight through as values
+_RESULT_COLUMNS = (
+    'file_name', 'file_path', 'file_type', 'department', 'revision',
+    'drawing_type', 'plant_area', 'equipment_included', 'issue_status',
+    'notes', 'todos', 'last_modified', 'created_date'
+)
 
 class SearchScreen(ttk.Frame):
     def __init__(self, parent, controller):
@@ -18,6 +28,19 @@ class SearchScreen(ttk.Frame):
         # Sorting state
         self.sort_column = None
         self.sort_reverse = False
+
+        # Pending search scheduled by the Enter key
+        self._search_job = None
+        # Bumped per search so results of a superseded one are dropped
+        self._search_generation = 0
+
+        # Criteria of the last search, re-run in a new order on sort
+        self._criteria: Dict[str, Any] = {}
+
+        # Full result set of the last search; rows are inserted into the
+        # tree a page at a time as the user scrolls towards the end
+        self._all_results: List[tuple] = []
+        self._shown_count = 0
         
         # Column configurations
         self.column_configs = [
@@ -35,6 +58,23 @@ class SearchScreen(ttk.Frame):
             ('modified', 'Modified', 150),
             ('created', 'Created', 150)
         ]
+
+        # Database field behind each results column, used for sorting
+        self.column_fields = {
+            'name': 'file_name',
+            'path': 'file_path',
+            'type': 'file_type',
+            'department': 'department',
+            'revision': 'revision',
+            'drawing_type': 'drawing_type',
+            'plant_area': 'plant_area',
+            'equipment': 'equipment_included',
+            'issue_status': 'issue_status',
+            'notes': 'notes',
+            'todos': 'todos',
+            'modified': 'last_modified',
+            'created': 'created_date'
+        }
         
         # Create the main layout
         self._create_widgets()
@@ -110,7 +150,7 @@ class SearchScreen(ttk.Frame):
             elif field == 'file_type':
                 widget = ttk.Combobox(
                     criteria_frame,
-                    values=list(set(FILE_TYPES.values())),
+                    values=FILE_TYPE_CHOICES,
                     state='readonly'
                 )
             elif field in ('last_modified', 'created_date'):
@@ -127,7 +167,7 @@ class SearchScreen(ttk.Frame):
             
             # Bind Enter key to search function for all entry widgets
             if isinstance(widget, ttk.Entry):
-                widget.bind('<Return>', lambda e: self._perform_search())
+                widget.bind('<Return>', lambda e: self._schedule_search())
         
         # Button Frame
         button_frame = ttk.Frame(criteria_frame)
@@ -184,8 +224,9 @@ class SearchScreen(ttk.Frame):
             command=self.results_tree.xview
         )
         
+        self.y_scrollbar = y_scrollbar
         self.results_tree.configure(
-            yscrollcommand=y_scrollbar.set,
+            yscrollcommand=self._on_results_scrolled,
             xscrollcommand=x_scrollbar.set
         )
         
@@ -207,12 +248,18 @@ class SearchScreen(ttk.Frame):
         if not widget.get():
             widget.insert(0, "YYYY-MM-DD")
             
+    def _schedule_search(self):
+        """Debounce Enter presses so a burst of them runs a single search"""
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DEBOUNCE_MS, self._perform_search)
+
     def _perform_search(self):
         """Execute search based on criteria"""
-        # Clear existing results
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
-            
+        # A search run directly supersedes one queued by the Enter key
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+            self._search_job = None
         # Gather search criteria
         criteria = {}
         for field, widget in self.search_widgets.items():
@@ -220,41 +267,91 @@ class SearchScreen(ttk.Frame):
             if value and value != "YYYY-MM-DD":  # Skip empty fields and date placeholders
                 criteria[field] = value
                 
-        try:
-            # Use the controller's database manager to perform search
-            results = self.controller.db.search_files(criteria)
-            
-            # Update results tree
-            for result in results:
-                self.results_tree.insert(
-                    '',
-                    'end',
-                    values=(
-                        result['file_name'],
-                        result['file_path'],
-                        result['file_type'],
-                        result['department'],
-                        result['revision'],
-                        result['drawing_type'],
-                        result['plant_area'],
-                        result['equipment_included'],
-                        result['issue_status'],
-                        result['notes'],
-                        result['todos'],
-                        result.get('last_modified', '').split('.')[0],  # Remove microseconds
-                        result.get('created_date', '').split('.')[0]  # Remove microseconds
-                    )
-                )
-                
-            self.logger.info(f"Search completed: {len(results)} results found")
+        self._criteria = criteria
+        self._search_in_background()
             
-        except sqlite3.Error as e:
+    def _search_in_background(self):
+        """Run the last search in the current sort order on the worker thread"""
+        self._search_generation += 1
+        generation = self._search_generation
+        # Newest first unless a column header picked another order
+        if self.sort_column is None:
+            order_by, descending = 'last_modified', True
+        else:
+            order_by, descending = self.column_fields[self.sort_column], self.sort_reverse
+
+        # A repeat of a recent search is served from the result cache
+        self.controller.run_in_background(
+            self.controller.db.search_files_cached,
+            self._criteria,
+            order_by,
+            descending,
+            _RESULT_COLUMNS,
+            callback=lambda f: self._on_search_done(generation, f)
+        )
+
+    def _on_search_done(self, generation: int, future: Future):
+        """Show a background search's results unless a newer search has started"""
+        if generation != self._search_generation:
+            return
+        try:
+            results = future.result()
+        except (sqlite3.Error, ValueError) as e:
             self.logger.error(f"Database error during search: {e}")
             messagebox.showerror(
                 "Search Error",
                 "An error occurred while searching the database"
             )
-            
+            return
+
+        self._show_results(results)
+        self.logger.info(f"Search completed: {len(results)} results found")
+
+    def _show_results(self, results: List[tuple]):
+        """Replace the tree contents with the first page of results"""
+        # Clear existing results in a single Tk call
+        self.results_tree.delete(*self.results_tree.get_children())
+        self._all_results = results
+        self._shown_count = 0
+        self.results_tree.yview_moveto(0)
+        self._append_results_page()
+
+    def _append_results_page(self):
+        """Insert the next SEARCH_RESULTS_PER_PAGE results into the tree"""
+        start = self._shown_count
+        page = self._all_results[start:start + SEARCH_RESULTS_PER_PAGE]
+        if not page:
+            return
+        self._shown_count = start + len(page)
+
+        # Results are plain tuples in column order; only the two epoch
+        # dates need formatting before the rows go into the tree
+        rows = [
+            result[:-2] + (
+                format_timestamp(result[-2]) if result[-2] is not None else '',
+                format_timestamp(result[-1]) if result[-1] is not None else ''
+            )
+            for result in page
+        ]
+
+        # Hide the columns while inserting so the rows are laid out once
+        display_columns = self.results_tree['displaycolumns']
+        self.results_tree.configure(displaycolumns=())
+        try:
+            insert = self.results_tree.insert
+            for values in rows:
+                insert('', 'end', values=values)
+        finally:
+            self.results_tree.configure(displaycolumns=display_columns)
+
+    def _on_results_scrolled(self, first, last):
+        """Update the scrollbar and load another page once the view nears the end"""
+        self.y_scrollbar.set(first, last)
+        # Also fires after each page is laid out, so a view taller than one
+        # page keeps filling until it can scroll
+        if float(last) > 0.9 and self._shown_count < len(self._all_results):
+            self._append_results_page()
+
     def _clear_search(self):
         """Clear all search criteria and results"""
         # Clear search widgets
@@ -267,9 +364,10 @@ class SearchScreen(ttk.Frame):
             else:
                 widget.delete(0, tk.END)
                 
-        # Clear results
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
+        # Clear results, dropping any search still running
+        self._search_generation += 1
+        self._criteria = {}
+        self._show_results([])
             
     def _on_result_double_click(self, event):
         """Handle double-click on search result"""
@@ -307,11 +405,11 @@ class SearchScreen(ttk.Frame):
             self.sort_column = column
             self.sort_reverse = False
 
-        items = [(self.results_tree.set(item, column), item) for item in self.results_tree.get_children('')]
-        items.sort(reverse=self.sort_reverse)
-        
-        for index, (_, item) in enumerate(items):
-            self.results_tree.move(item, '', index)
+        # Let SQLite order the full result set; empty values sort first,
+        # as blank cells did before. With nothing shown, only the order is
+        # recorded for the next search
+        if self._all_results:
+            self._search_in_background()
 
         # Update column headers
         for col in self.results_tree['columns']:
@@ -2,12 +2,32 @@ import os
 from pathlib import Path
 from datetime import datetime
 import re
+from collections import Counter
+from functools import lru_cache
 from typing import Dict, List, Optional, Union, Any
 import logging
 from config import JOB_FOLDER_PATTERN, FILE_TYPES, METADATA_FIELDS
 
 logger = logging.getLogger('app.utils')
 
+# Compiled once at import; these run for every folder and file in a walk.
+# The small per-item helpers below don't catch their own errors; callers
+# looping over many items handle failures once, around the loop
+_JOB_FOLDER_RE = re.compile(JOB_FOLDER_PATTERN)
+
+# Characters not allowed in filenames, each mapped to '_'
+_SANITIZE_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+# Units for format_file_size, each 1024 times the last
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# Common revision patterns (e.g., "REV A", "R1", "V2.0"), tried in order
+_REVISION_PATTERNS = (
+    re.compile(r'REV\s*([A-Z0-9]+)'),
+    re.compile(r'R(\d+)'),
+    re.compile(r'V(\d+(\.\d+)?)'),
+)
+
 def validate_job_folder(folder_path: str) -> bool:
     """
     Validate that a folder name matches the required 1YY###-PH pattern.
@@ -18,12 +38,12 @@ def validate_job_folder(folder_path: str) -> bool:
     Returns:
         bool: True if valid, False otherwise
     """
-    try:
-        folder_name = os.path.basename(folder_path)
-        return bool(re.match(JOB_FOLDER_PATTERN, folder_name))
-    except Exception as e:
-        logger.error(f"Error validating job folder {folder_path}: {e}")
-        return False
+    return _is_job_folder_name(os.path.basename(folder_path))
+
+@lru_cache(maxsize=256)
+def _is_job_folder_name(folder_name: str) -> bool:
+    """Match a folder name against the job pattern; cached since walks revisit names"""
+    return _JOB_FOLDER_RE.match(folder_name) is not None
 
 def get_file_type(file_path: str) -> str:
     """
@@ -35,12 +55,8 @@ def get_file_type(file_path: str) -> str:
     Returns:
         str: Mapped file type or 'OTHER' if unknown
     """
-    try:
-        extension = os.path.splitext(file_path)[1].lower()
-        return FILE_TYPES.get(extension, 'OTHER')
-    except Exception as e:
-        logger.error(f"Error getting file type for {file_path}: {e}")
-        return 'OTHER'
+    extension = os.path.splitext(file_path)[1].lower()
+    return FILE_TYPES.get(extension, 'OTHER')
 
 def format_timestamp(timestamp: Union[str, datetime]) -> str:
     """
@@ -52,13 +68,9 @@ def format_timestamp(timestamp: Union[str, datetime]) -> str:
     Returns:
         str: Formatted timestamp string
     """
-    try:
-        if isinstance(timestamp, str):
-            timestamp = datetime.fromisoformat(timestamp)
-        return timestamp.strftime('%Y-%m-%d %H:%M:%S')
-    except Exception as e:
-        logger.error(f"Error formatting timestamp {timestamp}: {e}")
-        return str(timestamp)
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    return timestamp.strftime('%Y-%m-%d %H:%M:%S')
 
 def get_relative_path(file_path: str, base_path: str) -> str:
     """
@@ -72,7 +84,11 @@ def get_relative_path(file_path: str, base_path: str) -> str:
         str: Relative path
     """
     try:
-        return str(Path(file_path).relative_to(base_path))
+        relative = os.path.relpath(file_path, base_path)
+        # Like Path.relative_to, refuse paths outside the base directory
+        if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+            raise ValueError(f"{file_path} is not under {base_path}")
+        return relative
     except Exception as e:
         logger.error(f"Error getting relative path for {file_path}: {e}")
         return file_path
@@ -110,9 +126,12 @@ def calculate_file_stats(file_paths: List[str]) -> Dict[str, int]:
     """
     stats = {'total': len(file_paths), 'by_type': {}}
     try:
-        for path in file_paths:
-            file_type = get_file_type(path)
-            stats['by_type'][file_type] = stats['by_type'].get(file_type, 0) + 1
+        # Same mapping as get_file_type, inlined to skip its per-path
+        # call and try/except
+        splitext = os.path.splitext
+        stats['by_type'] = dict(Counter(
+            FILE_TYPES.get(splitext(path)[1].lower(), 'OTHER') for path in file_paths
+        ))
     except Exception as e:
         logger.error(f"Error calculating file statistics: {e}")
     return stats
@@ -128,23 +147,26 @@ def ensure_directory(directory: Union[str, Path]) -> bool:
         bool: True if directory exists or was created successfully
     """
     try:
-        Path(directory).mkdir(parents=True, exist_ok=True)
+        os.makedirs(directory, exist_ok=True)
         return True
     except Exception as e:
         logger.error(f"Error ensuring directory {directory}: {e}")
         return False
 
-def is_file_readable(file_path: str) -> bool:
+def is_file_readable(file_path: Union[str, os.DirEntry]) -> bool:
     """
     Check if a file exists and is readable.
     
     Args:
-        file_path (str): Path to file
+        file_path (Union[str, os.DirEntry]): Path to file, or a scandir entry
+            whose cached stat answers the file check without a syscall
         
     Returns:
         bool: True if file is readable
     """
     try:
+        if isinstance(file_path, os.DirEntry):
+            return file_path.is_file() and os.access(file_path.path, os.R_OK)
         return os.path.isfile(file_path) and os.access(file_path, os.R_OK)
     except Exception as e:
         logger.error(f"Error checking file readability for {file_path}: {e}")
@@ -160,15 +182,8 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         str: Sanitized filename
     """
-    try:
-        # Remove or replace invalid characters
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        return filename.strip()
-    except Exception as e:
-        logger.error(f"Error sanitizing filename {filename}: {e}")
-        return filename
+    # Replace invalid characters in a single pass
+    return filename.translate(_SANITIZE_TABLE).strip()
 
 def format_file_size(size_bytes: int) -> str:
     """
@@ -180,15 +195,9 @@ def format_file_size(size_bytes: int) -> str:
     Returns:
         str: Formatted size string (e.g., "1.5 MB")
     """
-    try:
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024
-        return f"{size_bytes:.1f} TB"
-    except Exception as e:
-        logger.error(f"Error formatting file size {size_bytes}: {e}")
-        return f"{size_bytes} B"
+    # Each unit is 10 more bits, so the bit length picks it directly
+    exponent = min(max((int(size_bytes).bit_length() - 1) // 10, 0), 4)
+    return f"{size_bytes / (1 << (10 * exponent)):.1f} {_SIZE_UNITS[exponent]}"
 
 def parse_revision(filename: str) -> Optional[str]:
     """
@@ -201,15 +210,9 @@ def parse_revision(filename: str) -> Optional[str]:
         Optional[str]: Extracted revision or None if not found
     """
     try:
-        # Common revision patterns (e.g., "REV A", "R1", "V2.0")
-        patterns = [
-            r'REV\s*([A-Z0-9]+)',
-            r'R(\d+)',
-            r'V(\d+(\.\d+)?)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, filename.upper())
+        name = filename.upper()
+        for pattern in _REVISION_PATTERNS:
+            match = pattern.search(name)
             if match:
                 return match.group(1)
         return None
@@ -2,12 +2,26 @@ import os
 from pathlib import Path
 from datetime import datetime
 import re
+from collections import Counter
 from typing import Dict, List, Optional, Union, Any
 import logging
 from config import FILE_TYPES, METADATA_FIELDS
 
 logger = logging.getLogger('app.utils')
 
+# Characters not allowed in filenames, each mapped to '_'
+_SANITIZE_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+# Units for format_file_size, each 1024 times the last
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# Common revision patterns (e.g., "REV A", "R1", "V2.0"), tried in order
+_REVISION_PATTERNS = (
+    re.compile(r'REV\s*([A-Z0-9]+)'),
+    re.compile(r'R(\d+)'),
+    re.compile(r'V(\d+(\.\d+)?)'),
+)
+
 def get_file_type(file_path: str) -> str:
     """
     Determine file type from extension using predefined mapping.
@@ -25,18 +39,21 @@ def get_file_type(file_path: str) -> str:
         logger.error(f"Error getting file type for {file_path}: {e}")
         return 'OTHER'
 
-def format_timestamp(timestamp: Union[str, datetime]) -> str:
+def format_timestamp(timestamp: Union[str, float, datetime]) -> str:
     """
     Format a timestamp consistently for display.
     
     Args:
-        timestamp (Union[str, datetime]): Timestamp to format
+        timestamp (Union[str, float, datetime]): Timestamp to format; numbers
+            are epoch seconds as stored for file times
         
     Returns:
         str: Formatted timestamp string
     """
     try:
-        if isinstance(timestamp, str):
+        if isinstance(timestamp, (int, float)):
+            timestamp = datetime.fromtimestamp(timestamp)
+        elif isinstance(timestamp, str):
             timestamp = datetime.fromisoformat(timestamp)
         return timestamp.strftime('%Y-%m-%d %H:%M:%S')
     except Exception as e:
@@ -55,7 +72,11 @@ def get_relative_path(file_path: str, base_path: str) -> str:
         str: Relative path
     """
     try:
-        return str(Path(file_path).relative_to(base_path))
+        relative = os.path.relpath(file_path, base_path)
+        # Like Path.relative_to, refuse paths outside the base directory
+        if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+            raise ValueError(f"{file_path} is not under {base_path}")
+        return relative
     except Exception as e:
         logger.error(f"Error getting relative path for {file_path}: {e}")
         return file_path
@@ -93,9 +114,12 @@ def calculate_file_stats(file_paths: List[str]) -> Dict[str, int]:
     """
     stats = {'total': len(file_paths), 'by_type': {}}
     try:
-        for path in file_paths:
-            file_type = get_file_type(path)
-            stats['by_type'][file_type] = stats['by_type'].get(file_type, 0) + 1
+        # Same mapping as get_file_type, inlined to skip its per-path
+        # call and try/except
+        splitext = os.path.splitext
+        stats['by_type'] = dict(Counter(
+            FILE_TYPES.get(splitext(path)[1].lower(), 'OTHER') for path in file_paths
+        ))
     except Exception as e:
         logger.error(f"Error calculating file statistics: {e}")
     return stats
@@ -111,23 +135,26 @@ def ensure_directory(directory: Union[str, Path]) -> bool:
         bool: True if directory exists or was created successfully
     """
     try:
-        Path(directory).mkdir(parents=True, exist_ok=True)
+        os.makedirs(directory, exist_ok=True)
         return True
     except Exception as e:
         logger.error(f"Error ensuring directory {directory}: {e}")
         return False
 
-def is_file_readable(file_path: str) -> bool:
+def is_file_readable(file_path: Union[str, os.DirEntry]) -> bool:
     """
     Check if a file exists and is readable.
     
     Args:
-        file_path (str): Path to file
+        file_path (Union[str, os.DirEntry]): Path to file, or a scandir entry
+            whose cached stat answers the file check without a syscall
         
     Returns:
         bool: True if file is readable
     """
     try:
+        if isinstance(file_path, os.DirEntry):
+            return file_path.is_file() and os.access(file_path.path, os.R_OK)
         return os.path.isfile(file_path) and os.access(file_path, os.R_OK)
     except Exception as e:
         logger.error(f"Error checking file readability for {file_path}: {e}")
@@ -143,15 +170,8 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         str: Sanitized filename
     """
-    try:
-        # Remove or replace invalid characters
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        return filename.strip()
-    except Exception as e:
-        logger.error(f"Error sanitizing filename {filename}: {e}")
-        return filename
+    # Replace invalid characters in a single pass
+    return filename.translate(_SANITIZE_TABLE).strip()
 
 def format_file_size(size_bytes: int) -> str:
     """
@@ -164,11 +184,9 @@ def format_file_size(size_bytes: int) -> str:
         str: Formatted size string (e.g., "1.5 MB")
     """
     try:
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024
-        return f"{size_bytes:.1f} TB"
+        # Each unit is 10 more bits, so the bit length picks it directly
+        exponent = min(max((int(size_bytes).bit_length() - 1) // 10, 0), 4)
+        return f"{size_bytes / (1 << (10 * exponent)):.1f} {_SIZE_UNITS[exponent]}"
     except Exception as e:
         logger.error(f"Error formatting file size {size_bytes}: {e}")
         return f"{size_bytes} B"
@@ -184,15 +202,9 @@ def parse_revision(filename: str) -> Optional[str]:
         Optional[str]: Extracted revision or None if not found
     """
     try:
-        # Common revision patterns (e.g., "REV A", "R1", "V2.0")
-        patterns = [
-            r'REV\s*([A-Z0-9]+)',
-            r'R(\d+)',
-            r'V(\d+(\.\d+)?)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, filename.upper())
+        name = filename.upper()
+        for pattern in _REVISION_PATTERNS:
+            match = pattern.search(name)
             if match:
                 return match.group(1)
         return None